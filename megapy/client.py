@@ -8,11 +8,21 @@ Example:
     ...         print(node)
 """
 import asyncio
+import binascii
 import logging
+import os
+import re
+import struct
 import sys
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union, Callable
+from stat import S_ISREG
+from typing import Optional, List, Dict, Any, Union, Callable, Iterable, TYPE_CHECKING
+from urllib.parse import urlparse
 from dataclasses import dataclass, field
+import aiohttp
+from Crypto.Cipher import AES
 from .core.nodes.key import KeyFileManager
 from .core.api import (
     AsyncAPIClient,
@@ -22,48 +32,69 @@ from .core.api import (
     ProxyConfig,
     SSLConfig,
     TimeoutConfig,
-    RetryConfig
+    RetryConfig,
+    StandardAccountRegistration,
+    RegistrationData,
+    rsa_pool
 )
 from .core.upload import UploadCoordinator, UploadConfig, UploadResult, UploadProgress
 from .core.upload.models import FileAttributes
-from .core.crypto import Base64Encoder, AESCrypto
+from .core.attributes.packer import AttributesPacker
+from .core.crypto import Base64Encoder, AESCrypto, KeyManager, unmerge_key_mac, aes_cbc_decrypt_into
+from .core.crypto.file import create_ctr_decryptor
+from .core.download import AsyncFileWriter, BufferPool
 from .core.session import SessionStorage, SessionData, SQLiteSession, MemorySession
-from .core.nodes import NodeService
+from .core.nodes import NodeService, FolderImporter
 from .node import Node
 
+if TYPE_CHECKING:
+    from .core.attributes import MediaProcessor, ThumbnailService, PreviewService
+
 # Backward compatibility
 MegaFile = Node
 MegaNode = Node
 
-
-import logging
 logger = logging.getLogger(__name__)
 
-@dataclass  
+# File attribute response header: [handle.8 data_length.4 (little endian)]
+_ATTR_LEN_STRUCT = struct.Struct('<I')
+
+# Path of a MEGA link: /folder/HANDLE or /file/HANDLE
+_MEGA_URL_RE = re.compile(r'/(folder|file)/([^#/?]+)')
+
+# Display names for AccountInfo.account_type
+_ACCOUNT_TYPE_NAMES = {0: "Free", 1: "Pro I", 2: "Pro II", 3: "Pro III", 4: "Lite", 100: "Business"}
+
+
+@dataclass(slots=True, frozen=True)
 class UserInfo:
-    """User account information."""
+    """
+    User account information.
+    
+    Instances are immutable; free_storage and usage_percent are computed
+    once at construction.
+    """
     user_id: str
     email: str
     name: str
     total_storage: int = 0
     used_storage: int = 0
+    free_storage: int = field(init=False, repr=False, compare=False)
+    usage_percent: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def free_storage(self) -> int:
-        return self.total_storage - self.used_storage
-    
-    @property
-    def usage_percent(self) -> float:
-        if self.total_storage == 0:
-            return 0.0
-        return (self.used_storage / self.total_storage) * 100
+    def __post_init__(self):
+        object.__setattr__(self, 'free_storage', self.total_storage - self.used_storage)
+        object.__setattr__(self, 'usage_percent', self.used_storage * 100.0 / (self.total_storage or 1))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AccountInfo:
     """
     MEGA account storage and bandwidth information.
     
+    Instances are immutable; the derived space_* and is_* values are
+    computed once at construction.
+    
     Attributes:
         account_type: Account type (0=free, 1=pro1, 2=pro2, 3=pro3, 4=lite, 100=business)
         space_used: Storage used in bytes
@@ -72,6 +103,13 @@ class AccountInfo:
         download_bandwidth_total: Total download bandwidth (default 10PB for pro)
         shared_bandwidth_used: Shared bandwidth used
         shared_bandwidth_limit: Shared bandwidth ratio limit
+        space_free: Free storage space in bytes
+        space_used_percent: Storage usage percentage
+        space_free_gb: Free storage in GB
+        space_used_gb: Used storage in GB
+        space_total_gb: Total storage in GB
+        is_free_account: True for free accounts
+        is_pro_account: True for paid (Pro, Lite, Business) accounts
     """
     account_type: int
     space_used: int
@@ -80,51 +118,34 @@ class AccountInfo:
     download_bandwidth_total: int = 0
     shared_bandwidth_used: int = 0
     shared_bandwidth_limit: float = 0.0
-    
-    @property
-    def space_free(self) -> int:
-        """Free storage space in bytes."""
-        return max(0, self.space_total - self.space_used)
-    
-    @property
-    def space_used_percent(self) -> float:
-        """Storage usage percentage."""
-        if self.space_total == 0:
-            return 0.0
-        return (self.space_used / self.space_total) * 100
-    
-    @property
-    def space_free_gb(self) -> float:
-        """Free storage in GB."""
-        return self.space_free / (1024 ** 3)
-    
-    @property
-    def space_used_gb(self) -> float:
-        """Used storage in GB."""
-        return self.space_used / (1024 ** 3)
-    
-    @property
-    def space_total_gb(self) -> float:
-        """Total storage in GB."""
-        return self.space_total / (1024 ** 3)
-    
-    @property
-    def is_free_account(self) -> bool:
-        """Check if this is a free account."""
-        return self.account_type == 0
-    
-    @property
-    def is_pro_account(self) -> bool:
-        """Check if this is a pro account."""
-        return self.account_type in (1, 2, 3, 4, 100)
+    space_free: int = field(init=False, repr=False, compare=False)
+    space_used_percent: float = field(init=False, repr=False, compare=False)
+    space_free_gb: float = field(init=False, repr=False, compare=False)
+    space_used_gb: float = field(init=False, repr=False, compare=False)
+    space_total_gb: float = field(init=False, repr=False, compare=False)
+    is_free_account: bool = field(init=False, repr=False, compare=False)
+    is_pro_account: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        space_free = max(0, self.space_total - self.space_used)
+        derived = {
+            'space_free': space_free,
+            'space_used_percent': self.space_used * 100.0 / (self.space_total or 1),
+            'space_free_gb': space_free / (1024 ** 3),
+            'space_used_gb': self.space_used / (1024 ** 3),
+            'space_total_gb': self.space_total / (1024 ** 3),
+            'is_free_account': self.account_type == 0,
+            'is_pro_account': self.account_type in (1, 2, 3, 4, 100),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
     
     def has_space_for(self, file_size: int) -> bool:
         """Check if account has enough space for a file."""
         return self.space_free >= file_size
     
     def __str__(self) -> str:
-        type_names = {0: "Free", 1: "Pro I", 2: "Pro II", 3: "Pro III", 4: "Lite", 100: "Business"}
-        type_name = type_names.get(self.account_type, f"Unknown({self.account_type})")
+        type_name = _ACCOUNT_TYPE_NAMES.get(self.account_type, f"Unknown({self.account_type})")
         return (
             f"Account: {type_name}\n"
             f"Storage: {self.space_used_gb:.2f} GB / {self.space_total_gb:.2f} GB "
@@ -154,6 +175,22 @@ class MegaClient:
     """
     
     _codecs_cache: Optional[dict] = None  # Class-level cache for codec list
+    _codecs_applied: Optional[dict] = None  # Codec list last merged into the media maps
+    _media_processor: Optional['MediaProcessor'] = None  # Shared media services
+    _thumbnail_service: Optional['ThumbnailService'] = None
+    _preview_service: Optional['PreviewService'] = None
+    
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Multiple of the AES block size
+    DOWNLOAD_READ_BUFSIZE = 10 * 1024 * 1024
+    PROGRESS_MIN_BYTES = 4 * 1024 * 1024  # Report progress at most every 4 MiB...
+    PROGRESS_MIN_INTERVAL = 0.5  # ...or every 0.5 seconds
+    ATTRIBUTE_DOWNLOAD_CONCURRENCY = 16
+    DOWNLOAD_MANY_CONCURRENCY = 8  # Files in flight in download_many()
+    UPLOAD_MANY_CONCURRENCY = 8  # Files in flight in upload_many()
+    RANGE_PART_SIZE = 4 * 1024 * 1024  # read_file_range() splits larger reads...
+    RANGE_READ_CONCURRENCY = 8  # ...into parallel range GETs
+    ACCOUNT_INFO_TTL = 30.0  # Seconds a get_account_info() result is reused
+    DEFAULT_DOWNLOAD_BANDWIDTH = (1024 ** 5) * 10  # Reported when 'mxfer' is absent (pro: 10 PB)
     
     def __init__(
         self,
@@ -178,11 +215,9 @@ class MegaClient:
             email: Optional email for login (used with session mode)
             password: Optional password for login (used with session mode)
         """
-        from .core.logging import get_logger
-        
         self._config = config or APIConfig.default()
         self._auto_reconnect = auto_reconnect
-        self._logger = get_logger('megapy.client')
+        self._logger = logger
         
         # Determine mode based on arguments
         if session is None:
@@ -215,15 +250,23 @@ class MegaClient:
         self._auth: Optional[AsyncAuthService] = None
         self._auth_result: Optional[AuthResult] = None
         
+        # Shared HTTP session for transfers (downloads, file attributes)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
         # State
         self._master_key: Optional[bytes] = None
+        self._master_cipher: Optional[tuple] = None  # (master_key, AES-ECB cipher)
+        self._account_info: Optional[tuple] = None  # (monotonic timestamp, AccountInfo)
         self._node_service: Optional[NodeService] = None
+        self._nodes_lock = asyncio.Lock()  # Serializes node tree fetches
+        self._nodes_generation = 0  # Bumped by every completed fetch
         self._current_node: Optional[Node] = None
         
         # Registration state (for multi-step registration)
         self._registration_master_key: Optional[bytes] = None
         self._registration_client_random_value: Optional[bytes] = None
         self._registration_password: Optional[str] = None
+        self._registration_rsa_future: Optional[asyncio.Future] = None
     
     # =========================================================================
     # Configuration helpers
@@ -277,7 +320,8 @@ class MegaClient:
     async def start(
         self,
         email: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        prefetch: bool = False
     ) -> 'MegaClient':
         """
         Start the client - login or resume session.
@@ -288,6 +332,8 @@ class MegaClient:
         Args:
             email: Optional email (skips prompt)
             password: Optional password (skips prompt)
+            prefetch: Also fetch codecs, the node tree and account info
+                concurrently right after login
             
         Returns:
             Self for chaining
@@ -314,6 +360,8 @@ class MegaClient:
                     self._logger.debug(f"Trying to resume sessions.. {session_data.email}")
                     await self._resume_session(session_data)
                     self._logger.debug(f"Session resumed for {session_data.email}")
+                    if prefetch:
+                        await self._prefetch()
                     return self
                 except Exception as e:
                     self._logger.warning(f"Failed to resume session {self._session} : {e}")
@@ -329,31 +377,36 @@ class MegaClient:
         
         # Fresh login
         await self._do_login()
+        if prefetch:
+            await self._prefetch()
         
         return self
     
+    async def _prefetch(self) -> None:
+        """Fetch codecs, nodes and account info concurrently after login."""
+        results = await asyncio.gather(
+            self.load_codecs(),
+            self._ensure_nodes(),
+            self.get_account_info(),
+            return_exceptions=True
+        )
+        for name, result in zip(('codecs', 'nodes', 'account info'), results):
+            if isinstance(result, Exception):
+                self._logger.warning(f"Failed to prefetch {name}: {result}")
+    
     async def _prompt_credentials(self) -> tuple:
         """Prompt user for credentials interactively."""
+        if self._email and self._password:
+            return self._email, self._password
+        # Both prompts run in one worker thread so the loop stays responsive
+        return await asyncio.to_thread(self._read_credentials)
+    
+    def _read_credentials(self) -> tuple:
+        """Read missing credentials from the terminal (blocking)."""
         import getpass
         
-        loop = asyncio.get_event_loop()
-        
-        # Use thread executor for blocking input
-        def get_email():
-            return input("Enter email: ")
-        
-        def get_password():
-            return getpass.getpass("Enter password: ")
-        
-        email = self._email
-        password = self._password
-        
-        if not email:
-            email = await loop.run_in_executor(None, get_email)
-        
-        if not password:
-            password = await loop.run_in_executor(None, get_password)
-        
+        email = self._email or input("Enter email: ")
+        password = self._password or getpass.getpass("Enter password: ")
         return email, password
     
     async def _do_login(self) -> UserInfo:
@@ -430,6 +483,8 @@ class MegaClient:
         self._session.delete()
         self._auth_result = None
         self._master_key = None
+        self._master_cipher = None
+        self._account_info = None
         self._node_service = None
         self._current_node = None
         
@@ -474,8 +529,14 @@ class MegaClient:
             await self._api.close()
             self._api = None
         
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+        
         if hasattr(self._session, 'close'):
             self._session.close()
+        
+        self._discard_registration_key()
     
     # =========================================================================
     # Authentication (backward compatible)
@@ -506,7 +567,7 @@ class MegaClient:
             return self._session.path
         return None
     
-    async def get_account_info(self) -> AccountInfo:
+    async def get_account_info(self, refresh: bool = False) -> AccountInfo:
         """
         Get account storage and bandwidth information.
         
@@ -515,6 +576,11 @@ class MegaClient:
         - Download bandwidth used and limits
         - Account type
         
+        Results are reused for ACCOUNT_INFO_TTL seconds.
+        
+        Args:
+            refresh: Query the API even if a recent result is cached
+        
         Returns:
             AccountInfo with storage and bandwidth details
             
@@ -526,6 +592,11 @@ class MegaClient:
         """
         self._ensure_logged_in()
         
+        if not refresh and self._account_info:
+            fetched_at, info = self._account_info
+            if time.monotonic() - fetched_at < self.ACCOUNT_INFO_TTL:
+                return info
+        
         # Request account quota info
         # a=uq: user quota, strg=1: storage info, xfer=1: transfer info, pro=1: pro status
         response = await self._api.request({
@@ -534,19 +605,18 @@ class MegaClient:
             'xfer': 1,
             'pro': 1
         })
-        
-        # Default bandwidth for pro accounts (10 PB)
-        default_bandwidth = (1024 ** 5) * 10
-        
-        return AccountInfo(
-            account_type=response.get('utype', 0),
-            space_used=response.get('cstrg', 0),
-            space_total=response.get('mstrg', 0),
-            download_bandwidth_used=response.get('caxfer', 0),
-            download_bandwidth_total=response.get('mxfer', default_bandwidth),
-            shared_bandwidth_used=response.get('csxfer', 0),
-            shared_bandwidth_limit=response.get('srvratio', 0)
+        get = response.get
+        info = AccountInfo(
+            account_type=get('utype', 0),
+            space_used=get('cstrg', 0),
+            space_total=get('mstrg', 0),
+            download_bandwidth_used=get('caxfer', 0),
+            download_bandwidth_total=get('mxfer', self.DEFAULT_DOWNLOAD_BANDWIDTH),
+            shared_bandwidth_used=get('csxfer', 0),
+            shared_bandwidth_limit=get('srvratio', 0)
         )
+        self._account_info = (time.monotonic(), info)
+        return info
     
     # =========================================================================
     # Properties (Clean API)
@@ -594,7 +664,9 @@ class MegaClient:
         return codecs
     
     def _apply_codecs(self, codecs: dict) -> None:
-        """Apply codec mappings to global maps."""
+        """Apply codec mappings to global maps (skipped if already applied)."""
+        if codecs is MegaClient._codecs_applied:
+            return
         from .core.attributes.media import (
             CONTAINER_MAP, VIDEO_CODEC_MAP, AUDIO_CODEC_MAP, SHORTFORMAT_MAP
         )
@@ -602,6 +674,7 @@ class MegaClient:
         VIDEO_CODEC_MAP.update(codecs.get('video', {}))
         AUDIO_CODEC_MAP.update(codecs.get('audio', {}))
         SHORTFORMAT_MAP.update(codecs.get('shortformat', {}))
+        MegaClient._codecs_applied = codecs
     
     @property
     def files(self) -> List[Node]:
@@ -621,8 +694,7 @@ class MegaClient:
         """Load nodes from server. Returns root node."""
         self._ensure_logged_in()
         
-        if refresh or self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes(refresh)
         
         return self._node_service.root
     
@@ -634,8 +706,7 @@ class MegaClient:
         """Get node by path (e.g., '/Documents/file.pdf')."""
         self._ensure_logged_in()
         
-        if refresh or self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes(refresh)
         
         return self._node_service.find_by_path(path)
     
@@ -643,11 +714,18 @@ class MegaClient:
         """Find first node matching name."""
         self._ensure_logged_in()
         
-        if self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes()
         
         return self._node_service.find_by_name(name)
     
+    async def find_all(self, name: str) -> List[Node]:
+        """Find all nodes matching name."""
+        self._ensure_logged_in()
+        
+        await self._ensure_nodes()
+        
+        return self._node_service.find_all_by_name(name)
+    
     # =========================================================================
     # Backward Compatibility
     # =========================================================================
@@ -656,46 +734,50 @@ class MegaClient:
         """List files in folder (backward compat)."""
         self._ensure_logged_in()
         
-        if refresh or self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes(refresh)
         
-        if folder:
-            node = self._node_service.get(folder)
-            return node.files if node else []
+        node_service = self._node_service
+        if not folder:
+            root = node_service.root
+            return root.files if root else []
         
-        return self._node_service.root.files if self._node_service.root else []
+        node = node_service.get(folder)
+        return node.files if node else []
     
-    async def get_all_files(self, refresh: bool = False) -> List[Node]:
-        """Get all files flat (backward compat)."""
+    async def get_all_files(self, refresh: bool = False) -> Iterable[Node]:
+        """
+        Get all nodes flat (backward compat).
+        
+        Returns a live view over the loaded nodes instead of copying them;
+        use get_all_files_list() when a list is required.
+        """
         await self.load(refresh)
-        return list(self._node_service.nodes.values())
+        return self._node_service.nodes.values()
+    
+    async def get_all_files_list(self, refresh: bool = False) -> List[Node]:
+        """Get all nodes flat as a list."""
+        return list(await self.get_all_files(refresh))
     
     async def cd(self, path: str) -> Node:
         """Change current directory."""
         self._ensure_logged_in()
         
-        if self._node_service is None:
-            await self._load_nodes()
-        
-        root = self._node_service.root
-        if self._current_node is None:
-            self._current_node = root
+        await self._ensure_nodes()
         
+        node_service = self._node_service
         if path == "/":
-            self._current_node = root
+            node = node_service.root
         elif path.startswith("/"):
-            node = self._node_service.find_by_path(path)
-            if node is None:
-                raise FileNotFoundError(f"Path not found: {path}")
-            self._current_node = node
+            node = node_service.find_by_path(path)
         else:
             # Relative path
-            node = self._current_node.find(path)
-            if node is None:
-                raise FileNotFoundError(f"Path not found: {path}")
-            self._current_node = node
+            node = (self._current_node or node_service.root).find(path)
+        
+        if node is None:
+            raise FileNotFoundError(f"Path not found: {path}")
         
-        return self._current_node
+        self._current_node = node
+        return node
     
     def pwd(self) -> str:
         """Get current working directory path."""
@@ -773,11 +855,14 @@ class MegaClient:
         self._ensure_logged_in()
         
         path = Path(file_path)
-        if not path.exists():
+        try:
+            file_stat = path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
+        if not S_ISREG(file_stat.st_mode):
+            raise ValueError(f"Path is not a file: {file_path}")
         
-        if self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes()
         
         target_id = dest_folder or self._node_service.root_handle
         
@@ -785,84 +870,39 @@ class MegaClient:
         attrs = FileAttributes(
             name=name or path.name,
             label=label,
-            mega_id=mega_id
+            mega_id=mega_id,
+            mtime=int(file_stat.st_mtime)  # Reuse the stat above
         )
         
         # Add extra attributes (flat)
         for key, value in extra_attrs.items():
             attrs.set(key, value)
         
-        # Handle thumbnail/preview - custom or auto-generated
-        thumb_data = None
-        preview_data = None
-        media_info = None
-        
-        # Load and resize custom thumbnail if provided
-        if thumbnail is not None:
-            try:
-                from .core.attributes import ThumbnailService
-                thumb_gen = ThumbnailService()
-                # Convert to Path if string
-                thumb_source = Path(thumbnail) if isinstance(thumbnail, str) else thumbnail
-                thumb_data = thumb_gen.generate(thumb_source)
-            except Exception as e:
-                self._logger.warning(f"Failed to generate custom thumbnail: {e}")
-        
-        # Load and resize custom preview if provided
-        if preview is not None:
-            try:
-                from .core.attributes import PreviewService
-                preview_gen = PreviewService()
-                # Convert to Path if string
-                preview_source = Path(preview) if isinstance(preview, str) else preview
-                preview_data = preview_gen.generate(preview_source)
-            except Exception as e:
-                self._logger.warning(f"Failed to generate custom preview: {e}")
-        
-        # Auto-generate thumbnails if not provided and auto_thumb is True
-        if auto_thumb and (thumb_data is None or preview_data is None):
-            from .core.attributes import MediaProcessor
-            processor = MediaProcessor()
-            if processor.is_media(path):
-                self._logger.info("Generating thumbnail and preview for media file")
-                result = await processor.process(path)
-                if thumb_data is None:
-                    thumb_data = result.thumbnail
-                    if thumb_data:
-                        self._logger.debug("Thumbnail generated successfully")
-                if preview_data is None:
-                    preview_data = result.preview
-                    if preview_data:
-                        self._logger.debug("Preview generated successfully")
-        
-        # Always extract media attributes for videos (independent of auto_thumb)
-        try:
-            from .core.attributes import MediaProcessor
-            processor = MediaProcessor()
-            if processor.is_video(path):
-                self._logger.info("Extracting media metadata for video file")
-                media_info = processor.extract_metadata(path)
-                if media_info:
-                    self._logger.debug("Media metadata extracted successfully")
-        except Exception as e:
-            self._logger.debug(f"Could not extract media metadata: {e}")
+        # Thumbnail/preview (custom or auto-generated) and media info are
+        # produced while the file data uploads; the coordinator awaits them
+        media_task = asyncio.create_task(
+            self._prepare_media(path, auto_thumb, thumbnail, preview)
+        )
         
         coordinator = UploadCoordinator(
             api_client=self._api,
             master_key=self._master_key,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            session=await self._ensure_http_session()
         )
         
         config = UploadConfig(
             file_path=path,
             target_folder_id=target_id,
             attributes=attrs,
-            thumbnail=thumb_data,
-            preview=preview_data,
-            media_info=media_info
+            file_size=file_stat.st_size,
+            pending_media=media_task
         )
         
-        result = await coordinator.upload(config)
+        try:
+            result = await coordinator.upload(config)
+        finally:
+            media_task.cancel()  # No-op once the coordinator has awaited it
         
         node = Node(
             handle=result.node_handle,
@@ -877,11 +917,70 @@ class MegaClient:
         # Add to node service tree and update parent-child relationships
         if self._node_service:
             self._node_service.add_node(node)
+        self._account_info = None  # Storage use changed
         
         file_size_mb = result.file_size / (1024 * 1024)
         self._logger.info(f"Upload finished successfully: {path.name} -> {result.node_handle} ({file_size_mb:.2f} MB)")
         return node
     
+    async def _prepare_media(
+        self,
+        path: Path,
+        auto_thumb: bool,
+        thumbnail: Optional[Union[str, Path, bytes]],
+        preview: Optional[Union[str, Path, bytes]]
+    ) -> tuple:
+        """
+        Build thumbnail, preview and media metadata for an upload.
+        
+        Custom images take precedence over generated ones. The work is CPU
+        and subprocess bound, so it runs off the event loop, with the
+        independent jobs in parallel.
+        
+        Returns:
+            Tuple of (thumbnail bytes, preview bytes, MediaInfo), each may be None
+        """
+        processor = self._get_media_processor()
+        jobs = {}
+        
+        if thumbnail is not None:
+            thumb_source = Path(thumbnail) if isinstance(thumbnail, str) else thumbnail
+            jobs['thumbnail'] = asyncio.to_thread(self._get_thumbnail_service().generate, thumb_source)
+        
+        if preview is not None:
+            preview_source = Path(preview) if isinstance(preview, str) else preview
+            jobs['preview'] = asyncio.to_thread(self._get_preview_service().generate, preview_source)
+        
+        # One pass (single decode) for auto thumbnail/preview and video metadata
+        if processor.is_media(path):
+            generate_images = auto_thumb and (thumbnail is None or preview is None)
+            jobs['media'] = asyncio.to_thread(processor.inspect, path, generate_images)
+        
+        results = dict(zip(jobs, await asyncio.gather(*jobs.values(), return_exceptions=True)))
+        
+        thumb_data = results.get('thumbnail')
+        if isinstance(thumb_data, Exception):
+            self._logger.warning(f"Failed to generate custom thumbnail: {thumb_data}")
+            thumb_data = None
+        
+        preview_data = results.get('preview')
+        if isinstance(preview_data, Exception):
+            self._logger.warning(f"Failed to generate custom preview: {preview_data}")
+            preview_data = None
+        
+        media_info = None
+        media = results.get('media')
+        if isinstance(media, Exception):
+            self._logger.debug(f"Could not process media file: {media}")
+        elif media is not None:
+            if thumb_data is None:
+                thumb_data = media.thumbnail
+            if preview_data is None:
+                preview_data = media.preview
+            media_info = media.metadata
+        
+        return thumb_data, preview_data, media_info
+    
     async def update(
         self,
         file: Union[str, MegaFile],
@@ -947,78 +1046,43 @@ class MegaClient:
         
         # Upload the new content as a replacement
         new_path = Path(new_content)
-        if not new_path.exists():
+        try:
+            file_stat = new_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"New content file not found: {new_content}")
         
         # Use original name if not specified
         file_name = name or existing_file.name
         
-        # Build attributes
-        attrs = FileAttributes(name=file_name)
+        # Build attributes (one stat serves size and mtime)
+        attrs = FileAttributes(name=file_name, mtime=int(file_stat.st_mtime))
         
-        # Process thumbnails (same logic as upload)
-        thumb_data = None
-        preview_data = None
-        media_info = None
-        
-        if thumbnail is not None:
-            try:
-                from .core.attributes import ThumbnailService
-                thumb_gen = ThumbnailService()
-                thumb_source = Path(thumbnail) if isinstance(thumbnail, str) else thumbnail
-                thumb_data = thumb_gen.generate(thumb_source)
-            except Exception as e:
-                self._logger.warning(f"Failed to generate custom thumbnail: {e}")
-        
-        if preview is not None:
-            try:
-                from .core.attributes import PreviewService
-                preview_gen = PreviewService()
-                preview_source = Path(preview) if isinstance(preview, str) else preview
-                preview_data = preview_gen.generate(preview_source)
-            except Exception as e:
-                self._logger.warning(f"Failed to generate custom preview: {e}")
-        
-        if auto_thumb and (thumb_data is None or preview_data is None):
-            try:
-                from .core.attributes import MediaProcessor
-                processor = MediaProcessor()
-                if processor.is_media(new_path):
-                    result = processor.process(new_path)
-                    if thumb_data is None:
-                        thumb_data = result.thumbnail
-                    if preview_data is None:
-                        preview_data = result.preview
-            except Exception:
-                pass
-        
-        # Extract media info for videos
-        try:
-            from .core.attributes import MediaProcessor
-            processor = MediaProcessor()
-            if processor.is_video(new_path):
-                media_info = processor.extract_metadata(new_path)
-        except Exception:
-            pass
+        # Generated while the new content uploads (see upload())
+        media_task = asyncio.create_task(
+            self._prepare_media(new_path, auto_thumb, thumbnail, preview)
+        )
         
         # Create upload coordinator with replace_handle
         coordinator = UploadCoordinator(
             api_client=self._api,
             master_key=self._master_key,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            session=await self._ensure_http_session()
         )
         
         config = UploadConfig(
             file_path=new_path,
             target_folder_id=parent_handle,
             attributes=attrs,
-            thumbnail=thumb_data,
-            preview=preview_data,
-            media_info=media_info,
-            replace_handle=existing_file.handle  # Key: tells MEGA to create version
+            replace_handle=existing_file.handle,  # Key: tells MEGA to create version
+            file_size=file_stat.st_size,
+            pending_media=media_task
         )
         
-        result = await coordinator.upload(config)
+        try:
+            result = await coordinator.upload(config)
+        finally:
+            media_task.cancel()  # No-op once the coordinator has awaited it
         
         node = Node(
             handle=result.node_handle,
@@ -1032,12 +1096,42 @@ class MegaClient:
         
         # Update node service cache
         if self._node_service:
-            self._node_service.nodes[result.node_handle] = node
+            self._node_service.add_node(node)
+        self._account_info = None  # Storage use changed
         
         self._logger.info(f"File updated: {existing_file.handle} -> {result.node_handle}")
         
         return node
     
+    async def upload_many(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        dest_folder: Optional[str] = None,
+        concurrency: int = UPLOAD_MANY_CONCURRENCY,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[MegaFile]:
+        """
+        Upload many files, keeping up to `concurrency` in flight.
+        
+        Args:
+            file_paths: Local file paths
+            dest_folder: Destination folder handle. None for root.
+            concurrency: Maximum simultaneous uploads
+            progress_callback: Optional callback(completed_files, total_files)
+            
+        Returns:
+            Uploaded files, in the order given
+            
+        Raises:
+            Exception: The first failed upload; the others are cancelled
+        """
+        return await self._transfer_many(
+            file_paths,
+            lambda path: self.upload(path, dest_folder),
+            concurrency,
+            progress_callback
+        )
+    
     # =========================================================================
     # Download
     # =========================================================================
@@ -1084,30 +1178,144 @@ class MegaClient:
         if dest.is_dir():
             dest = dest / mega_file.name
         
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.get(download_url) as response:
-                response.raise_for_status()
-                
-                downloaded = 0
-                with open(dest, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(131072):
-                        if mega_file.key:
-                            chunk = self._decrypt_chunk(chunk, mega_file.key, downloaded)
-                        
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if progress_callback:
+        session = await self._ensure_http_session()
+        async with session.get(download_url) as response:
+            response.raise_for_status()
+            
+            # One stateful CTR context for the whole stream
+            decryptor = create_ctr_decryptor(mega_file.key) if mega_file.key else None
+            
+            # Decrypt into reusable buffers (update_into needs 15 spare bytes);
+            # the writer hands each one back once it's on disk
+            pool = BufferPool(
+                self.DOWNLOAD_CHUNK_SIZE + 15,
+                AsyncFileWriter.DEFAULT_MAX_PENDING + 2
+            )
+            
+            downloaded = 0
+            reported = 0
+            last_report = time.monotonic()
+            buffer = None
+            filled = 0
+            async with AsyncFileWriter(dest, pool=pool) as writer:
+                async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                    if decryptor:
+                        # Reads often return less than a full chunk; decrypt them
+                        # back to back into one buffer and write it once it's full
+                        view = memoryview(chunk)
+                        while view:
+                            if buffer is None:
+                                buffer = await pool.acquire()
+                                filled = 0
+                            take = min(len(view), self.DOWNLOAD_CHUNK_SIZE - filled)
+                            filled += decryptor.update_into(view[:take], memoryview(buffer)[filled:])
+                            view = view[take:]
+                            if filled == self.DOWNLOAD_CHUNK_SIZE:
+                                await writer.write(memoryview(buffer)[:filled], buffer)
+                                buffer = None
+                    else:
+                        await writer.write(chunk)
+                    
+                    downloaded += len(chunk)
+                    
+                    if progress_callback:
+                        now = time.monotonic()
+                        if (downloaded - reported >= self.PROGRESS_MIN_BYTES
+                                or now - last_report >= self.PROGRESS_MIN_INTERVAL):
                             progress_callback(downloaded, file_size)
+                            reported, last_report = downloaded, now
+                
+                if buffer is not None:
+                    await writer.write(memoryview(buffer)[:filled], buffer)
+            
+            # Always report the final state
+            if progress_callback and reported != downloaded:
+                progress_callback(downloaded, file_size)
         
         return dest
     
+    async def download_many(
+        self,
+        files: Iterable[Union[str, MegaFile]],
+        dest_path: Union[str, Path] = ".",
+        concurrency: int = DOWNLOAD_MANY_CONCURRENCY,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[Path]:
+        """
+        Download many files, keeping up to `concurrency` in flight.
+        
+        Args:
+            files: File handles, names, or MegaFile objects
+            dest_path: Local destination directory
+            concurrency: Maximum simultaneous downloads
+            progress_callback: Optional callback(completed_files, total_files)
+            
+        Returns:
+            Paths of the downloaded files, in the order given
+            
+        Raises:
+            Exception: The first failed download; the others are cancelled
+        """
+        return await self._transfer_many(
+            files,
+            lambda file: self.download(file, dest_path),
+            concurrency,
+            progress_callback
+        )
+    
+    async def _transfer_many(
+        self,
+        items: Iterable[Any],
+        transfer: Callable[[Any], Any],
+        concurrency: int,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> List[Any]:
+        """
+        Run `transfer` over items with `concurrency` workers, failing fast.
+        
+        Workers take items from a FIFO queue; once one transfer fails no
+        worker takes another item and the others are cancelled.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in enumerate(items):
+            queue.put_nowait(entry)
+        completed = 0
+        failed = False
+        
+        async def worker():
+            nonlocal completed, failed
+            while not failed and not queue.empty():
+                index, item = queue.get_nowait()
+                try:
+                    results[index] = await transfer(item)
+                except BaseException:
+                    failed = True
+                    raise
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, len(items))
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return results
+    
     def _decrypt_chunk(self, data: bytes, key: bytes, position: int) -> bytes:
         """
         Decrypt a file chunk using AES-CTR.
         
-        Uses MegaDecrypt class for consistent decryption logic.
+        Builds a CTR decryptor positioned at `position`, for random-access
+        reads. Sequential downloads keep a single decryptor instead.
         
         MEGA uses AES-CTR mode for file encryption. The key format is:
         - key[:16]: AES key (16 bytes)
@@ -1122,12 +1330,8 @@ class MegaClient:
         Returns:
             Decrypted data
         """
-        from .core.crypto.file import MegaDecrypt
-        
-        # Use MegaDecrypt with position option to handle counter correctly
-        decryptor = MegaDecrypt(key, options={'position': position})
-        # Decrypt without MAC verification (we're just decrypting a chunk)
-        return decryptor.decrypt(data, position=position)
+        # No MAC verification here, we're just decrypting a chunk
+        return create_ctr_decryptor(key, position).update(data)
     
     async def get_download_url(self, node: 'MegaFile') -> tuple[str, int]:
         """
@@ -1163,6 +1367,10 @@ class MegaClient:
         """
         Read a range of bytes from a file without downloading the entire file.
         
+        Ranges larger than RANGE_PART_SIZE are fetched as parallel range
+        requests (at most RANGE_READ_CONCURRENCY at a time), each decrypted
+        in place with its own CTR counter.
+        
         Args:
             node: Node to read from
             offset: Starting byte offset
@@ -1170,6 +1378,9 @@ class MegaClient:
             
         Returns:
             Decrypted bytes from the file
+            
+        Raises:
+            ValueError: If a range part returns more or fewer bytes than asked for
         """
         self._ensure_logged_in()
         
@@ -1184,30 +1395,58 @@ class MegaClient:
         
         actual_size = min(size, file_size - offset)
         
-        # Download the range
-        import aiohttp
-        headers = {
-            'Range': f'bytes={offset}-{offset + actual_size - 1}'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(download_url, headers=headers) as response:
-                response.raise_for_status()
-                encrypted_data = await response.read()
-        
-        # Decrypt if node has a key
-        # Note: MEGA files are encrypted, so we always need to decrypt
+        # MEGA files are encrypted, so we always need to decrypt
         if not node.key:
             raise ValueError(f"Node {node.handle} does not have a decryption key")
         
-        # Decrypt the chunk starting from the offset
-        # The position parameter in _decrypt_chunk is the byte offset in the decrypted file
-        from megapy.core.nodes.decryptor import KeyDecryptor
-        from megapy.core.crypto import unmerge_key_mac
         key = unmerge_key_mac(node.key)
         
-        decrypted_data = self._decrypt_chunk(encrypted_data, key, offset)
-        return decrypted_data
+        # Decrypt each received chunk straight into one output buffer
+        # (update_into needs 15 spare bytes) instead of joining the
+        # ciphertext first and decrypting it into a second copy
+        output = bytearray(actual_size + 15)
+        view = memoryview(output)
+        
+        session = await self._ensure_http_session()
+        semaphore = asyncio.Semaphore(self.RANGE_READ_CONCURRENCY)
+        
+        async def read_part(start: int, length: int) -> None:
+            # CTR counter starts at the part's byte offset in the decrypted file
+            decryptor = create_ctr_decryptor(key, offset + start)
+            headers = {
+                'Range': f'bytes={offset + start}-{offset + start + length - 1}'
+            }
+            decrypted = 0
+            async with semaphore:
+                async with session.get(download_url, headers=headers) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                        # A server ignoring or padding the range would spill
+                        # into the next part's bytes
+                        if decrypted + len(chunk) > length:
+                            raise ValueError(
+                                f"Range part at {offset + start} returned more than {length} bytes"
+                            )
+                        decrypted += decryptor.update_into(chunk, view[start + decrypted:])
+            if decrypted != length:
+                raise ValueError(
+                    f"Range part at {offset + start} returned {decrypted} of {length} bytes"
+                )
+        
+        tasks = [
+            asyncio.create_task(read_part(start, min(self.RANGE_PART_SIZE, actual_size - start)))
+            for start in range(0, actual_size, self.RANGE_PART_SIZE)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other parts downloading after the error
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        return bytes(view[:actual_size])
     
     async def _download_file_attribute(
         self,
@@ -1228,17 +1467,11 @@ class MegaClient:
         Returns:
             Decrypted attribute bytes or None
         """
-        from Crypto.Cipher import AES
-        import aiohttp
-        import struct
-        
         if not node.key:
             return None
         
-        encoder = Base64Encoder()
-        
         # Decode handle from base64url to binary (8 bytes)
-        handle_binary = encoder.decode(fa_handle)
+        handle_binary = Base64Encoder.decode(fa_handle)
         if len(handle_binary) != 8:
             return None
         
@@ -1260,18 +1493,11 @@ class MegaClient:
             return None
         
         # Download the encrypted data - POST binary handle to URL
-        import ssl
-        ssl_ctx = ssl.create_default_context()
-        ssl_ctx.check_hostname = False
-        ssl_ctx.verify_mode = ssl.CERT_NONE
-        ssl_ctx.set_ciphers('DEFAULT:@SECLEVEL=1')
-        connector = aiohttp.TCPConnector(ssl=ssl_ctx)
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(download_url, data=handle_binary) as resp:
-                if resp.status != 200:
-                    return None
-                response = await resp.read()
+        session = await self._ensure_http_session()
+        async with session.post(download_url, data=handle_binary) as resp:
+            if resp.status != 200:
+                return None
+            response = await resp.read()
         
         if not response or len(response) < 12:
             return None
@@ -1282,47 +1508,104 @@ class MegaClient:
         # Remaining bytes: encrypted data
         
         resp_handle = response[0:8]
-        data_len = struct.unpack('<I', response[8:12])[0]
+        data_len, = _ATTR_LEN_STRUCT.unpack_from(response, 8)
         
         # Verify handle matches
         if resp_handle != handle_binary:
             return None
         
         # Extract encrypted data
-        encrypted = response[12:12 + data_len]
-        if not encrypted:
+        length = min(data_len, len(response) - 12)
+        if length <= 0:
             return None
         
-        # Pad to 16-byte boundary for AES
-        padded_len = (len(encrypted) + 15) // 16 * 16
-        if len(encrypted) < padded_len:
-            encrypted = encrypted + b'\x00' * (padded_len - len(encrypted))
+        # Copy into a zero-padded, 16-byte aligned buffer (plus the 15 spare
+        # bytes update_into needs) and decrypt it in place
+        padded_len = (length + 15) // 16 * 16
+        buffer = bytearray(padded_len + 15)
+        buffer[:length] = memoryview(response)[12:12 + length]
         
         # Decrypt with file key
         # For 32-byte keys: XOR first 16 bytes with second 16 bytes
         # For 16-byte keys: use directly
-        key = node.key
-        if len(key) >= 32:
-            k = bytes(a ^ b for a, b in zip(key[:16], key[16:32]))
-        else:
-            k = key[:16]
+        k = get_file_key(node.key)
         
         # AES-CBC decrypt with zero IV
-        cipher = AES.new(k, AES.MODE_CBC, iv=b'\x00' * 16)
-        decrypted = cipher.decrypt(encrypted)
+        aes_cbc_decrypt_into(buffer, padded_len, k)
+        del buffer[padded_len:]
         
         # Find end of JPEG (FFD9) or remove padding
-        if decrypted[:2] == b'\xff\xd8':  # JPEG
-            end_marker = decrypted.rfind(b'\xff\xd9')
+        if buffer.startswith(b'\xff\xd8'):  # JPEG
+            end_marker = buffer.rfind(b'\xff\xd9')
             if end_marker > 0:
-                return decrypted[:end_marker + 2]
+                del buffer[end_marker + 2:]
+                return bytes(buffer)
         
         # Remove null padding for non-JPEG data
-        end = len(decrypted)
-        while end > 0 and decrypted[end - 1] == 0:
-            end -= 1
+        return bytes(buffer.rstrip(b'\x00') or buffer)
+    
+    async def get_thumbnails(self, nodes: Iterable[Node]) -> Dict[str, Optional[bytes]]:
+        """
+        Download thumbnails for many nodes concurrently.
+        
+        Args:
+            nodes: Nodes to fetch thumbnails for
+            
+        Returns:
+            Dict mapping node handle to thumbnail bytes (None if unavailable)
+        """
+        return await self._download_file_attributes_bulk(nodes, 0)
+    
+    async def get_previews(self, nodes: Iterable[Node]) -> Dict[str, Optional[bytes]]:
+        """
+        Download previews for many nodes concurrently.
         
-        return decrypted[:end] if end > 0 else decrypted
+        Args:
+            nodes: Nodes to fetch previews for
+            
+        Returns:
+            Dict mapping node handle to preview bytes (None if unavailable)
+        """
+        return await self._download_file_attributes_bulk(nodes, 1)
+    
+    async def _download_file_attributes_bulk(
+        self,
+        nodes: Iterable[Node],
+        attr_type: int
+    ) -> Dict[str, Optional[bytes]]:
+        """
+        Download a file attribute for many nodes at once.
+        
+        Fetches run concurrently under a semaphore; their 'ufa' API calls
+        land in the same request batch of the API client, so N attributes
+        cost roughly one API round trip plus N / concurrency POSTs.
+        
+        Args:
+            nodes: Nodes to fetch the attribute for
+            attr_type: 0=thumbnail, 1=preview
+            
+        Returns:
+            Dict mapping node handle to attribute bytes (None if unavailable)
+        """
+        self._ensure_logged_in()
+        
+        semaphore = asyncio.Semaphore(self.ATTRIBUTE_DOWNLOAD_CONCURRENCY)
+        
+        async def fetch(node: Node) -> Optional[bytes]:
+            fa_handle = node._get_fa_handle(attr_type)
+            if not fa_handle:
+                return None
+            async with semaphore:
+                try:
+                    return await self._download_file_attribute(node, fa_handle, attr_type)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # One failed attribute shouldn't fail the whole batch
+                    self._logger.debug(f"File attribute download failed for {node.handle}: {e}")
+                    return None
+        
+        nodes = list(nodes)
+        results = await asyncio.gather(*(fetch(node) for node in nodes))
+        return {node.handle: result for node, result in zip(nodes, results)}
     
     # =========================================================================
     # File operations
@@ -1338,7 +1621,8 @@ class MegaClient:
         
         await self._api.delete_node(mega_file.handle)
         if self._node_service:
-            self._node_service.nodes.pop(mega_file.handle, None)
+            self._node_service.remove_node(mega_file.handle)
+        self._account_info = None  # Storage use changed
         
         return True
     
@@ -1350,19 +1634,11 @@ class MegaClient:
         if not mega_file:
             raise FileNotFoundError(f"File not found: {file}")
         
-        encoder = Base64Encoder()
         attrs = {'n': new_name}
-        attrs_json = f"MEGA{__import__('json').dumps(attrs)}"
-        
-        padding = 16 - (len(attrs_json) % 16)
-        attrs_padded = attrs_json.encode() + (b'\x00' * padding)
-        
-        from Crypto.Cipher import AES
         if mega_file.key:
-            cipher = AES.new(mega_file.key[:16], AES.MODE_CBC, iv=b'\x00' * 16)
-            encrypted_attrs = encoder.encode(cipher.encrypt(attrs_padded))
+            encrypted_attrs = self._build_encrypted_attrs(mega_file.key, attrs)
         else:
-            encrypted_attrs = encoder.encode(attrs_padded)
+            encrypted_attrs = Base64Encoder.encode(AttributesPacker.pack_raw(attrs))
         
         await self._api.request({
             'a': 'a',
@@ -1370,9 +1646,29 @@ class MegaClient:
             'attr': encrypted_attrs
         })
         
-        mega_file.name = new_name
+        if self._node_service:
+            self._node_service.rename_node(mega_file, new_name)
+        else:
+            mega_file.name = new_name
         return mega_file
     
+    @staticmethod
+    def _build_encrypted_attrs(key: bytes, attrs: Dict[str, Any]) -> str:
+        """
+        Pack and encrypt node attributes for an API request.
+        
+        Args:
+            key: Node key (32-byte merged file key or 16-byte folder key)
+            attrs: Attributes dict, e.g. {'n': name}
+            
+        Returns:
+            Base64-encoded encrypted attributes
+        """
+        # File keys are stored merged with their MAC; attributes use the unmerged AES key
+        if len(key) >= 32:
+            key = unmerge_key_mac(key)
+        return Base64Encoder.encode(AttributesPacker.pack(attrs, key[:16]))
+    
     async def move(
         self,
         file: Union[str, MegaFile],
@@ -1412,10 +1708,29 @@ class MegaClient:
         Returns:
             Node representing the folder (existing or newly created)
         """
+        return (await self.create_folders([name], parent))[0]
+    
+    async def create_folders(
+        self,
+        names: Iterable[str],
+        parent: Optional[Union[str, MegaFile]] = None
+    ) -> List[Node]:
+        """
+        Create several folders in one parent with a single API call.
+        
+        Names that already exist as folders in the parent are returned
+        as they are; the rest are created together in one 'p' request.
+        
+        Args:
+            names: Folder names
+            parent: Parent folder (handle, path, or Node). None for root.
+            
+        Returns:
+            Nodes for each name, in the order given
+        """
         self._ensure_logged_in()
         
-        if self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes()
         
         # Resolve parent node
         parent_node = None
@@ -1427,57 +1742,70 @@ class MegaClient:
         else:
             parent_node = self._node_service.root
         
-        # Check if folder already exists in parent
-        if parent_node:
-            existing_folder = parent_node.get(name)
+        names = list(names)
+        folders: Dict[str, Node] = {}
+        to_create: List[str] = []
+        for name in dict.fromkeys(names):
+            # Check if folder already exists in parent
+            existing_folder = parent_node.get(name) if parent_node else None
             if existing_folder and existing_folder.is_folder:
-                # Folder already exists, return it
-                return existing_folder
-        
-        # Folder doesn't exist, create it
-        import os
-        import json
-        from Crypto.Cipher import AES
-        
-        folder_key = os.urandom(16)
-        
-        attrs = {'n': name}
-        attrs_json = f"MEGA{json.dumps(attrs)}"
-        padding = 16 - (len(attrs_json) % 16)
-        attrs_padded = attrs_json.encode() + (b'\x00' * padding)
-        
-        cipher = AES.new(folder_key, AES.MODE_CBC, iv=b'\x00' * 16)
-        encrypted_attrs = Base64Encoder().encode(cipher.encrypt(attrs_padded))
-        
-        master_cipher = AES.new(self._master_key, AES.MODE_ECB)
-        encrypted_key = Base64Encoder().encode(master_cipher.encrypt(folder_key))
+                folders[name] = existing_folder
+            else:
+                to_create.append(name)
+        
+        if to_create:
+            cipher = self._get_master_cipher()
+            new_nodes = []
+            for name in to_create:
+                folder_key = os.urandom(16)
+                new_nodes.append({
+                    'h': 'xxxxxxxx',
+                    't': 1,
+                    'a': self._build_encrypted_attrs(folder_key, {'n': name}),
+                    'k': Base64Encoder.encode(cipher.encrypt(folder_key))
+                })
+            
+            result = await self._api.request({
+                'a': 'p',
+                't': parent_id,
+                'n': new_nodes
+            })
+            
+            created = result.get('f', [])
+            if len(created) < len(to_create):
+                raise ValueError("Failed to create folder")
+            
+            for name, data in zip(to_create, created):
+                node = Node(
+                    handle=data['h'],
+                    name=name,
+                    is_folder=True,
+                    parent_handle=parent_id,
+                    _client=self
+                )
+                if self._node_service:
+                    # Add node to tree and update parent-child relationships
+                    self._node_service.add_node(node)
+                folders[name] = node
+            self._account_info = None  # Storage use changed
+        
+        return [folders[name] for name in names]
+    
+    async def resolve_urls(self, urls: Iterable[str]) -> List[Optional[Node]]:
+        """
+        Resolve several public MEGA links concurrently.
         
-        result = await self._api.request({
-            'a': 'p',
-            't': parent_id,
-            'n': [{
-                'h': 'xxxxxxxx',
-                't': 1,
-                'a': encrypted_attrs,
-                'k': encrypted_key
-            }]
-        })
+        File link lookups issued together go out in one batched API call.
+        Folder links are scoped to their own call by the n= query parameter
+        and are sent alongside.
         
-        if 'f' in result and len(result['f']) > 0:
-            data = result['f'][0]
-            node = Node(
-                handle=data['h'],
-                name=name,
-                is_folder=True,
-                parent_handle=parent_id,
-                _client=self
-            )
-            if self._node_service:
-                # Add node to tree and update parent-child relationships
-                self._node_service.add_node(node)
-            return node
-        
-        raise ValueError("Failed to create folder")
+        Args:
+            urls: Folder or file links (https://mega.nz/...#KEY)
+            
+        Returns:
+            Nodes for each link, in the order given
+        """
+        return list(await asyncio.gather(*(self._resolve_url(url) for url in urls)))
     
     async def import_link(
         self,
@@ -1511,8 +1839,7 @@ class MegaClient:
         """
         self._ensure_logged_in()
         
-        if self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes()
         
         # Resolve source node (can be folder or file)
         source = await self._resolve_file(source_node)
@@ -1527,8 +1854,6 @@ class MegaClient:
         if not target.is_folder:
             raise ValueError(f"Target must be a folder, got: {target.handle}")
         
-        from .core.nodes.folder_importer import FolderImporter
-        
         importer = FolderImporter(
             master_key=self._master_key,
             api_client=self._api,
@@ -1541,6 +1866,7 @@ class MegaClient:
             target_folder_handle=target.handle,
             clear_attributes=clear_attributes
         )
+        self._account_info = None  # Storage use changed
         
         # Return empty list for now (handles are returned but we'd need to fetch nodes)
         # TODO: Fetch and return actual Node objects from handles
@@ -1608,9 +1934,6 @@ class MegaClient:
             ...     if result.success:
             ...         print("Check your email for confirmation")
         """
-        import os
-        from .core.api.registration import StandardAccountRegistration, RegistrationData
-        
         # Initialize API client if not already done
         if self._api is None:
             self._api = AsyncAPIClient(self._config)
@@ -1635,6 +1958,10 @@ class MegaClient:
             self._registration_master_key = data.master_key
             self._registration_client_random_value = data.client_random_value
             self._registration_password = password
+            # The RSA key is only needed in finalize_registration; take it
+            # from the pool now so it's ready once the user confirms their email
+            self._discard_registration_key()
+            self._registration_rsa_future = asyncio.ensure_future(rsa_pool.get_key())
         
         return result
     
@@ -1694,8 +2021,6 @@ class MegaClient:
             ...     if confirm_result.success:
             ...         print(f"Email {confirm_result.email} confirmed")
         """
-        from .core.api.registration import StandardAccountRegistration
-        
         # Initialize API client if not already done
         if self._api is None:
             self._api = AsyncAPIClient(self._config)
@@ -1735,8 +2060,6 @@ class MegaClient:
             ...     if finalize_result.success:
             ...         print("Account fully activated!")
         """
-        from .core.api.registration import StandardAccountRegistration
-        
         # Check if we have the necessary registration data
         if not self._registration_master_key:
             raise RuntimeError(
@@ -1759,12 +2082,19 @@ class MegaClient:
         # Create registration handler
         registration = StandardAccountRegistration(self._api)
         
+        # Key taken by init_register, if it ran in this client
+        if self._registration_rsa_future is not None:
+            rsa_key = await self._registration_rsa_future
+        else:
+            rsa_key = await rsa_pool.get_key()
+        
         # Execute finalization
         result = await registration.finalize_registration(
             password=self._registration_password,
             confirm_code=confirm_code,
             master_key=self._registration_master_key,
-            client_random_value=self._registration_client_random_value
+            client_random_value=self._registration_client_random_value,
+            rsa_key=rsa_key
         )
         
         # Clear registration data after finalization
@@ -1772,6 +2102,7 @@ class MegaClient:
             self._registration_master_key = None
             self._registration_client_random_value = None
             self._registration_password = None
+            self._registration_rsa_future = None
         
         return result
     
@@ -1779,16 +2110,98 @@ class MegaClient:
     # Private helpers
     # =========================================================================
     
+    def _discard_registration_key(self) -> None:
+        """Cancel the RSA key taken by an abandoned init_register()."""
+        future, self._registration_rsa_future = self._registration_rsa_future, None
+        if future is None:
+            return
+        if future.done():
+            if not future.cancelled():
+                future.exception()  # Mark a failed key generation as retrieved
+        else:
+            future.cancel()
+    
+    def _get_media_processor(self) -> 'MediaProcessor':
+        """Get the shared MediaProcessor (created on first use)."""
+        if MegaClient._media_processor is None:
+            from .core.attributes import MediaProcessor
+            MegaClient._media_processor = MediaProcessor()
+        return MegaClient._media_processor
+    
+    def _get_thumbnail_service(self) -> 'ThumbnailService':
+        """Get the shared ThumbnailService (created on first use)."""
+        if MegaClient._thumbnail_service is None:
+            from .core.attributes import ThumbnailService
+            MegaClient._thumbnail_service = ThumbnailService()
+        return MegaClient._thumbnail_service
+    
+    def _get_preview_service(self) -> 'PreviewService':
+        """Get the shared PreviewService (created on first use)."""
+        if MegaClient._preview_service is None:
+            from .core.attributes import PreviewService
+            MegaClient._preview_service = PreviewService()
+        return MegaClient._preview_service
+    
+    async def _ensure_http_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared transfer session, creating it on first use.
+        
+        Keeps connections alive across downloads, range reads and file
+        attribute fetches so TLS handshakes are amortized, and asks for
+        uncompressed bodies since encrypted data does not compress.
+        """
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    keepalive_timeout=60,
+                    **self._config.get_connector_kwargs()
+                ),
+                read_bufsize=self.DOWNLOAD_READ_BUFSIZE,
+                # Payloads are encrypted, so compression only costs CPU
+                headers={'Accept-Encoding': 'identity'}
+            )
+        return self._http_session
+    
     def _ensure_logged_in(self):
         """Ensure user is logged in."""
         if not self._master_key:
             raise RuntimeError("Not logged in. Call start() or use 'async with' first.")
     
+    def _get_master_cipher(self):
+        """
+        Get the AES-ECB cipher for the master key.
+        
+        The key schedule is expanded once per master key and reused for
+        every node key encrypted by this client.
+        """
+        if self._master_cipher is None or self._master_cipher[0] != self._master_key:
+            self._master_cipher = (self._master_key, AES.new(self._master_key, AES.MODE_ECB))
+        return self._master_cipher[1]
+    
+    async def _ensure_nodes(self, refresh: bool = False) -> NodeService:
+        """
+        Load the node tree if it isn't loaded (or refresh is requested).
+        
+        Concurrent callers coalesce: whoever waited on the lock while
+        another caller fetched the tree reuses that result.
+        """
+        if not refresh and self._node_service is not None:
+            return self._node_service
+        
+        generation = self._nodes_generation
+        async with self._nodes_lock:
+            if self._nodes_generation == generation:
+                await self._load_nodes()
+        return self._node_service
+    
     async def _load_nodes(self):
         """Load all nodes from server using NodeService."""
         response = await self._api.get_files()
-        self._node_service = NodeService(self._master_key, self)
-        self._node_service.load(response)
+        node_service = NodeService(self._master_key, self)
+        # Decrypting every key and attribute blob is pure CPU; keep it off the loop
+        await asyncio.to_thread(node_service.load, response)
+        self._node_service = node_service
+        self._nodes_generation += 1
     
     async def _resolve_file(self, file: Union[str, Node]) -> Optional[Node]:
         """Resolve file argument to Node."""
@@ -1799,8 +2212,7 @@ class MegaClient:
         if isinstance(file, str) and file.startswith('https://mega.nz/'):
             return await self._resolve_url(file)
         
-        if self._node_service is None:
-            await self._load_nodes()
+        await self._ensure_nodes()
         
         node = self._node_service.get(file)
         if node:
@@ -1819,12 +2231,7 @@ class MegaClient:
         Returns:
             Node object for the folder/file, or None if not found
         """
-        import re
-        import base64
-        import binascii
-        from urllib.parse import urlparse
-        
-        logger.debug(f"Resolving MEGA URL: {url}")
+        logger.debug("Resolving MEGA URL: %s", url)
         
         # Parse URL
         parsed = urlparse(url)
@@ -1836,41 +2243,26 @@ class MegaClient:
             raise ValueError(f"Missing key in MEGA URL: {url}")
         
         # Extract handle and type from path
-        folder_match = re.search(r'/folder/([^#/?]+)', path)
-        file_match = re.search(r'/file/([^#/?]+)', path)
-        
-        if folder_match:
-            handle = folder_match.group(1)
-            is_folder = True
-            logger.debug(f"Detected folder URL, handle: {handle}")
-        elif file_match:
-            handle = file_match.group(1)
-            is_folder = False
-            logger.debug(f"Detected file URL, handle: {handle}")
-        else:
+        url_match = _MEGA_URL_RE.search(path)
+        if not url_match:
             logger.error(f"Invalid MEGA URL format: {url}")
             raise ValueError(f"Invalid MEGA URL format: {url}")
         
-        # Decode key from fragment
-        key_str = fragment
-        # Pad key if needed for base64 decoding
-        padding = len(key_str) % 4
-        if padding:
-            key_str += '=' * (4 - padding)
-            logger.debug(f"Padded key string for base64 decoding (padding: {4 - padding})")
+        kind, handle = url_match.groups()
+        is_folder = kind == 'folder'
+        logger.debug("Detected %s URL, handle: %s", kind, handle)
         
+        # Decode key from fragment (base64url, usually unpadded)
         try:
-            key_bytes = base64.urlsafe_b64decode(key_str)
-            logger.debug(f"Successfully decoded key from URL fragment (key length: {len(key_bytes)} bytes)")
+            key_bytes = Base64Encoder.decode(fragment)
+            logger.debug("Successfully decoded key from URL fragment (key length: %s bytes)", len(key_bytes))
         except (binascii.Error, ValueError) as e:
             logger.error(f"Failed to decode key from MEGA URL: {url}, error: {e}")
             raise ValueError(f"Invalid key in MEGA URL: {url}")
         
         # For folders, we need to fetch the folder info
         if is_folder:
-            print("its folder")
             logger.info(f"Resolving folder URL, handle: {handle}")
-            from .node import Node
             folder_node = Node(
                 handle=handle,
                 name=f"Folder-{handle}",  # Temporary name
@@ -1890,7 +2282,7 @@ class MegaClient:
             # Store the URL in _raw for later use during import
             folder_node._raw['_public_url'] = url
             
-            logger.debug(f"Requesting folder info from API for handle: {handle}")
+            logger.debug("Requesting folder info from API for handle: %s", handle)
             result = await self._api.request({
                 'a': 'f',
                 'c': 1,
@@ -1903,51 +2295,41 @@ class MegaClient:
             else:
                 nodes = result["f"]
             
-            logger.debug(f"Received {len(nodes)} nodes from API response")
+            logger.debug("Received %s nodes from API response", len(nodes))
             
-            print(nodes)
             node_data = nodes[0]
-                
-            logger.debug(f"Found matching folder node, updating with real data")
+            
+            logger.debug("Found matching folder node, updating with real data")
             # Update with real data
             folder_node._raw = node_data
             folder_node.handle = node_data["h"]
             # Try to decrypt name
-            from .core.attributes.packer import AttributesPacker
-            from .core.crypto import Base64Encoder
-            from .core.nodes.key import KeyFileManager
-            encoder = Base64Encoder()
-            
             if node_data.get('a') and key_bytes:
                 manager = KeyFileManager.parse_key(node_data["k"], key_bytes)
-                attrs = manager.decrypt_attributes(encoder.decode(node_data['a']))
+                attrs = manager.decrypt_attributes(Base64Encoder.decode(node_data['a']))
                 folder_node.attributes = attrs
                 if attrs:
                     folder_node.name = attrs.name
-                    logger.debug(f"Successfully decrypted folder name: {folder_node.name}")
+                    logger.debug("Successfully decrypted folder name: %s", folder_node.name)
                 else:
                     raise ValueError(f"Failed to decrypt folder attributes for handle: {handle}")
 
-            logger.debug(f"Loading children nodes for folder: {folder_node.name}")
-
-            
-            self._load_children_from_api_result(folder_node, nodes, key_bytes)
+            logger.debug("Loading children nodes for folder: %s", folder_node.name)
+            await self._load_children_from_api_result(folder_node, nodes, key_bytes)
             logger.info(f"Successfully resolved folder URL: {folder_node.name} ({handle})")
             return folder_node
         
         # For files, we can create a Node directly
         else:
-            print("its file")
             logger.info(f"Resolving file URL, handle: {handle}")
-            logger.debug(f"Requesting file info from API for handle: {handle}")
+            logger.debug("Requesting file info from API for handle: %s", handle)
             result = await self._api.request({
                 'a': 'g',
                 'p': handle
             })
             
-            logger.debug(f"Received file info from API: size={result.get('s', 0)}")
+            logger.debug("Received file info from API: size=%s", result.get('s', 0))
             
-            from .node import Node
             file_node = Node(
                 handle=handle,
                 name=handle,  # Will be decrypted from attributes if available
@@ -1959,10 +2341,6 @@ class MegaClient:
                 _raw=result
             )
             
-            from .core.attributes.packer import AttributesPacker
-            from .core.crypto import Base64Encoder
-            from .core.nodes.key import KeyFileManager
-            encoder = Base64Encoder()
             node_data = result
             
             # Try to decrypt attributes
@@ -1979,78 +2357,102 @@ class MegaClient:
                         # For file links, key_bytes might be the file key itself
                         manager = KeyFileManager.from_full_key(key_bytes, self._master_key)
                     
-                    attrs = manager.decrypt_attributes(encoder.decode(node_data['a']))
+                    attrs = manager.decrypt_attributes(Base64Encoder.decode(node_data['a']))
                     file_node.key = manager.full_key
                     file_node.attributes = attrs
                     if attrs:
                         file_node.name = attrs.name if hasattr(attrs, 'name') else attrs.to_dict().get('n', handle)
-                        logger.debug(f"Successfully decrypted file name: {file_node.name}")
+                        logger.debug("Successfully decrypted file name: %s", file_node.name)
                 except Exception as e:
                     logger.warning(f"Failed to decrypt file attributes: {e}, keeping default name")
                     # Keep default name if decryption fails
             logger.info(f"Successfully resolved file URL: {file_node.name} ({handle}), size: {file_node.size}")
             return file_node
-
-        return None
     
-    def _load_children_from_api_result(self, folder_node: 'Node', all_nodes: List[Dict[str, Any]], parent_key: bytes):
+    async def _load_children_from_api_result(self, folder_node: 'Node', all_nodes: List[Dict[str, Any]], parent_key: bytes):
         """Load children nodes from API result recursively."""
-        from .node import Node
-        from .core.attributes.packer import AttributesPacker
-        from .core.crypto import Base64Encoder
-        encoder = Base64Encoder()
-        
-        logger.debug(f"Loading children for folder: {folder_node.name} (handle: {folder_node.handle}), total nodes in result: {len(all_nodes)}")
-        print(all_nodes)
-        def process_children(parent_node: 'Node', parent_key: bytes, depth: int = 0):
-            """Recursively process children nodes."""
+        logger.debug("Loading children for folder: %s (handle: %s), total nodes in result: %s", folder_node.name, folder_node.handle, len(all_nodes))
+        
+        # Group nodes by parent once, so each folder only visits its own children
+        children_by_parent: Dict[str, List[Dict[str, Any]]] = {}
+        for node_data in all_nodes:
+            children_by_parent.setdefault(node_data.get('p'), []).append(node_data)
+        
+        # Decryption doesn't depend on the tree shape: collect the subtree and
+        # decrypt it all in one worker thread, keeping the event loop free
+        subtree = []
+        pending = [folder_node.handle]
+        while pending:
+            for node_data in children_by_parent.get(pending.pop(), ()):
+                subtree.append(node_data)
+                if node_data.get('t', 0) == 1:
+                    pending.append(node_data.get('h'))
+        decrypted = await asyncio.to_thread(self._decrypt_public_nodes, subtree, parent_key)
+        
+        # Breadth-first, so deep trees can't hit the recursion limit
+        queue = deque([(folder_node, 0)])
+        while queue:
+            parent_node, depth = queue.popleft()
             indent = "  " * depth
-            children_count = 0
-            print(parent_node)
-            for child_data in all_nodes:
-                if child_data.get('p') == parent_node.handle:
-                    children_count += 1
-                    child_handle = child_data.get('h', '')
-                    is_child_folder = (child_data.get('t', 0) == 1)
-                    logger.debug(f"{indent}Processing child: handle={child_handle}, type={'folder' if is_child_folder else 'file'}")
-                    
-                    manager = KeyFileManager.parse_key(child_data.get('k'), parent_key)
-                    attributes = manager.decrypt_attributes(
-                        encoder.decode(child_data.get('a', ''))
-                    )
-                    # Create child node
-                    child_node = Node(
-                        handle=child_handle,
-                        name=attributes.name,
-                        attributes=attributes,
-                        size=child_data.get('s', 0),
-                        is_folder=is_child_folder,
-                        parent_handle=parent_node.handle,
-                        key=manager.full_key,
-                        _client=self,
-                        _raw=child_data
-                    )
-                    
-                    # Set parent relationship
-                    child_node.parent = parent_node
-                    # Add to parent's children (not folder_node!)
-                    parent_node.children.append(child_node)
-                    
-                    # If it's a folder, recursively process its children
-                    # Always use parent_key (master_key) for all children, not the child's key
-                    if child_node.is_folder:
-                        process_children(child_node, parent_key, depth + 1)
-            
-            if children_count > 0:
-                logger.debug(f"{indent}Processed {children_count} children for parent: {parent_node.handle} ({parent_node.name})")
-        print("procssing")
-        process_children(folder_node, parent_key)
+            children = children_by_parent.get(parent_node.handle, ())
+            for child_data in children:
+                child_handle = child_data.get('h', '')
+                is_child_folder = (child_data.get('t', 0) == 1)
+                logger.debug("%sProcessing child: handle=%s, type=%s", indent, child_handle, 'folder' if is_child_folder else 'file')
+                
+                attributes, full_key = decrypted[child_handle]
+                # Create child node
+                child_node = Node(
+                    handle=child_handle,
+                    name=attributes.name if attributes else child_handle,
+                    attributes=attributes,
+                    size=child_data.get('s', 0),
+                    is_folder=is_child_folder,
+                    parent_handle=parent_node.handle,
+                    key=full_key,
+                    _client=self,
+                    _raw=child_data
+                )
+                
+                # Set parent relationship
+                child_node.parent = parent_node
+                # Add to parent's children (not folder_node!)
+                parent_node.children.append(child_node)
+                
+                # If it's a folder, process its children later
+                if child_node.is_folder:
+                    queue.append((child_node, depth + 1))
+            
+            if children:
+                logger.debug("%sProcessed %s children for parent: %s (%s)", indent, len(children), parent_node.handle, parent_node.name)
+        
         logger.info(f"Finished loading children for folder: {folder_node.name}, total children: {len(folder_node.children)}")
     
+    @staticmethod
+    def _decrypt_public_nodes(
+        nodes: List[Dict[str, Any]],
+        parent_key: bytes
+    ) -> Dict[str, tuple]:
+        """
+        Decrypt keys and attributes of public folder nodes.
+        
+        Every node in a folder link is keyed with the link's key (not its
+        own parent's), so the nodes are independent of each other.
+        
+        Returns:
+            Dict of handle -> (attributes or None, full key)
+        """
+        decrypted = {}
+        for node_data in nodes:
+            manager = KeyFileManager.parse_key(node_data.get('k'), parent_key)
+            # Nodes without an attribute blob have nothing to decrypt
+            attr_blob = node_data.get('a')
+            attributes = manager.decrypt_attributes(Base64Encoder.decode(attr_blob)) if attr_blob else None
+            decrypted[node_data.get('h', '')] = (attributes, manager.full_key)
+        return decrypted
+    
     def _decrypt_child_key(self, child_data: Dict[str, Any], parent_key: bytes) -> bytes:
         """Decrypt a child node's key using parent folder key."""
-        from .core.crypto.aes.aes_crypto import AESCrypto
-        
         child_handle = child_data.get('h', 'unknown')
         
         # Child key is encrypted with parent key
@@ -2069,9 +2471,7 @@ class MegaClient:
         
         # Decode and decrypt
         try:
-            from .core.crypto.utils.encoding import Base64Encoder
-            encoder = Base64Encoder()
-            enc_key_bytes = encoder.decode(enc_key_part)
+            enc_key_bytes = Base64Encoder.decode(enc_key_part)
             logger.debug(f"Decoded encrypted key bytes for child {child_handle} (length: {len(enc_key_bytes)} bytes)")
             logger.info(f"Decrypting child key for {child_handle} using parent key, key length: {len(parent_key)} bytes")
 
@@ -2090,5 +2490,5 @@ class MegaClient:
 
 def get_file_key(key):
     if len(key) >= 32:
-        return bytes(a ^ b for a, b in zip(key[:16], key[16:32]))
+        return KeyManager.xor(key[:16], key[16:32])
     return key[:16]
\ No newline at end of file
@@ -13,6 +13,7 @@ from .registration import (
     RegistrationData,
     RegistrationResult
 )
+from .rsa_pool import RSAKeyPool
 
 # Backward compatibility
 MegaApi = APIClient
@@ -35,6 +36,7 @@ __all__ = [
     'EphemeralAccountCreator',
     'RegistrationData',
     'RegistrationResult',
+    'RSAKeyPool',
     
     # Configuration
     'APIConfig',
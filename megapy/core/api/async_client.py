@@ -174,8 +174,13 @@ class AsyncAPIClient:
                 merged_qs = querystring
             data['_querystring'] = merged_qs
         
-        # For immediate requests (with special flags) or if retrying, don't batch
-        immediate = data.get('_immediate', False) or retry_count > 0
+        # For immediate requests (with special flags) or if retrying, don't batch.
+        # A querystring applies to the whole POST, so such requests go alone.
+        immediate = (
+            data.get('_immediate', False)
+            or retry_count > 0
+            or '_querystring' in data
+        )
         
         if immediate:
             return await self._request_immediate(data, retry_count)
@@ -207,15 +207,22 @@ class AccountRegistrationBase(ABC):
         
         return header + value_bytes
     
-    def _generate_rsa_keypair(self) -> Tuple[RSA.RsaKey, bytes, bytes]:
+    def _generate_rsa_keypair(
+        self,
+        key: Optional[RSA.RsaKey] = None
+    ) -> Tuple[RSA.RsaKey, bytes, bytes]:
         """
         Generate RSA key pair and encode in MEGA format.
         
+        Args:
+            key: Pre-generated 2048-bit key to encode instead of a new one
+            
         Returns:
             Tuple of (RSA key object, encoded private key bytes, encoded public key bytes)
         """
         # Generate 2048-bit RSA key pair
-        key = RSA.generate(2048)
+        if key is None:
+            key = RSA.generate(2048)
         
         # Extract components
         p = key.p
@@ -517,7 +524,8 @@ class StandardAccountRegistration(AccountRegistrationBase):
         password: str,
         confirm_code: str,
         master_key: bytes,
-        client_random_value: bytes
+        client_random_value: bytes,
+        rsa_key: Optional[RSA.RsaKey] = None
     ) -> FinalizeResult:
         """
         Finalize registration by completing verification and generating RSA keys (step 3).
@@ -535,6 +543,7 @@ class StandardAccountRegistration(AccountRegistrationBase):
             confirm_code: Confirmation code from email
             master_key: Master encryption key (from init_register)
             client_random_value: Client random value (from init_register)
+            rsa_key: Optional pre-generated RSA key, skips key generation
             
         Returns:
             FinalizeResult
@@ -566,7 +575,7 @@ class StandardAccountRegistration(AccountRegistrationBase):
                 ) """
             
             # Step 3: Generate RSA key pair
-            rsa_key, privk_encoded, pubk_encoded = self._generate_rsa_keypair()
+            rsa_key, privk_encoded, pubk_encoded = self._generate_rsa_keypair(rsa_key)
             
             # Step 4: Encrypt private key with master key
             aes = AES.new(master_key, AES.MODE_ECB)
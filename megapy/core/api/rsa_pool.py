@@ -0,0 +1,107 @@
+"""
+Pre-generated RSA keys for account registration.
+
+Generating a 2048-bit RSA key costs around a second of CPU. The pool
+generates keys in worker processes, so registration can start a key early
+and take it ready instead of generating one on the critical path. Worker
+processes start only when a key is first requested and are shut down at
+interpreter exit.
+
+The shared pool generates keys only on request. For bulk registrations,
+replace it with a refilling pool so keys are generated ahead across cores:
+
+    >>> rsa_pool.default_pool = RSAKeyPool(size=4, refill=True)
+"""
+import asyncio
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Optional, Tuple
+from Crypto.PublicKey import RSA
+
+
+def _generate_components(bits: int) -> Tuple[int, int, int, int, int]:
+    """Generate a key in a worker process and return its components."""
+    # RsaKey objects may wrap GMP integers, which don't pickle; plain ints do
+    key = RSA.generate(bits)
+    return key.n, key.e, key.d, key.p, key.q
+
+
+class RSAKeyPool:
+    """
+    Pool of RSA keys generated ahead of time in worker processes.
+
+    get_key() hands out the oldest key (waiting if it is still being
+    generated). With refill it also starts a replacement, so up to `size`
+    keys are always ready or in progress once the pool is in use.
+    """
+
+    def __init__(self, size: int = 2, bits: int = 2048, refill: bool = False):
+        """
+        Initialize RSA key pool.
+
+        Args:
+            size: Number of keys kept ready or in progress
+            bits: RSA modulus size in bits
+            refill: Start a replacement whenever a key is handed out
+        """
+        if size < 1:
+            raise ValueError("RSA key pool needs at least one key")
+
+        self._size = size
+        self._bits = bits
+        self._refill = refill
+        self._exit_hook = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._lock = threading.Lock()
+
+    def fill(self) -> None:
+        """Start generating keys until `size` are ready or in progress."""
+        with self._lock:
+            self._fill_locked()
+
+    def _fill_locked(self) -> None:
+        """Top up pending keys; the caller holds the lock."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._size)
+            if not self._exit_hook:
+                # Don't leave key generation running at interpreter exit
+                atexit.register(self.shutdown)
+                self._exit_hook = True
+        while len(self._pending) < self._size:
+            self._pending.append(self._executor.submit(_generate_components, self._bits))
+
+    def _take(self) -> Future:
+        """Pop the oldest pending key, topping up in the same lock section."""
+        # Threads or loops sharing the pool can't both take the same key
+        with self._lock:
+            self._fill_locked()
+            future = self._pending.popleft()
+            if self._refill:
+                self._fill_locked()
+        return future
+
+    async def get_key(self) -> RSA.RsaKey:
+        """Take a key from the pool, waiting if none is ready yet."""
+        components = await asyncio.wrap_future(self._take())
+        # Components come from RSA.generate, no need to re-check them
+        return RSA.construct(components, consistency_check=False)
+
+    def shutdown(self) -> None:
+        """Cancel keys not yet started and stop the worker processes."""
+        with self._lock:
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide pool shared by all clients; starts no processes until used
+default_pool = RSAKeyPool(size=1)
+
+
+async def get_key() -> RSA.RsaKey:
+    """Take a pre-generated RSA key from the process-wide pool."""
+    return await default_pool.get_key()
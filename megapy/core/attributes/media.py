@@ -5,7 +5,10 @@ Based on MEGA webclient's MediaAttribute implementation (js/crypto.js).
 Stores video/audio metadata like duration, resolution, fps, and codecs.
 """
 from __future__ import annotations
+import os
 import struct
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional, List, Tuple
 
@@ -531,11 +534,16 @@ class MediaAttributeService:
 
 @dataclass
 class MediaResult:
-    """Result of media processing with thumbnail and preview."""
+    """Result of media processing with thumbnail, preview and metadata."""
     thumbnail: Optional[bytes] = None
     preview: Optional[bytes] = None
     is_media: bool = False
     media_type: Optional[str] = None  # 'image' or 'video'
+    metadata: Optional[MediaInfo] = None  # Only filled by inspect() for videos
+    
+    @property
+    def is_video(self) -> bool:
+        return self.media_type == 'video'
 
 
 class MediaProcessor:
@@ -553,6 +561,8 @@ class MediaProcessor:
     
     from mediakit import VIDEO_EXTENSIONS, IMAGE_EXTENSIONS
     
+    METADATA_CACHE_SIZE = 256  # ffprobe results kept per processor
+    
     def __init__(
         self,
         auto_thumbnail: bool = True,
@@ -570,6 +580,12 @@ class MediaProcessor:
         self.auto_thumbnail = auto_thumbnail
         self.auto_preview = auto_preview
         self.video_frame_time = video_frame_time
+        # Stateless image services, created on first use and reused per file
+        self._thumbnail_service = None
+        self._preview_service = None
+        # (path, mtime_ns, size) -> MediaInfo, most recently used last
+        self._metadata_cache: OrderedDict = OrderedDict()
+        self._metadata_lock = threading.Lock()
     
     def is_media(self, file_path) -> bool:
         """Check if file is a supported media file (image or video)."""
@@ -609,10 +625,7 @@ class MediaProcessor:
         
         if self.is_image(path):
             result.media_type = 'image'
-            if self.auto_thumbnail:
-                result.thumbnail = self.generate_thumbnail(path)
-            if self.auto_preview:
-                result.preview = self.generate_preview(path)
+            self._generate_images(path, result)
         elif self.is_video(path):
             result.media_type = 'video'
             if self.auto_thumbnail:
@@ -622,21 +635,152 @@ class MediaProcessor:
         
         return result
     
+    def inspect(self, file_path, generate_images: bool = True) -> MediaResult:
+        """
+        Classify a media file and produce everything upload needs in one pass.
+        
+        Unlike calling process() and extract_metadata() separately, a video
+        frame is extracted once and shared by thumbnail and preview, and
+        ffprobe runs in the same call. This method blocks (Pillow, ffmpeg,
+        ffprobe), so call it from a worker thread in async code.
+        
+        Args:
+            file_path: Path to the media file
+            generate_images: Generate thumbnail/preview (per auto_* settings)
+            
+        Returns:
+            MediaResult with thumbnail, preview and (for videos) metadata
+        """
+        from pathlib import Path
+        path = Path(file_path)
+        ext = path.suffix.lower()
+        
+        if ext in self.IMAGE_EXTENSIONS:
+            result = MediaResult(is_media=True, media_type='image')
+            if generate_images:
+                self._generate_images(path, result)
+            return result
+        
+        if ext not in self.VIDEO_EXTENSIONS:
+            return MediaResult(is_media=False)
+        
+        result = MediaResult(is_media=True, media_type='video')
+        if generate_images and (self.auto_thumbnail or self.auto_preview):
+            frame_path = self._extract_video_frame(path)
+            if frame_path:
+                try:
+                    self._generate_images(frame_path, result)
+                finally:
+                    Path(frame_path).unlink(missing_ok=True)
+        result.metadata = self.probe_metadata(path)
+        return result
+    
+    def probe_metadata(self, file_path) -> Optional[MediaInfo]:
+        """
+        extract_metadata() with a cache keyed by path, mtime and size.
+        
+        Re-uploading or updating an unchanged file reuses the earlier ffprobe
+        result instead of spawning the subprocess again. Failed probes are
+        not cached.
+        
+        Args:
+            file_path: Path to the media file
+            
+        Returns:
+            MediaInfo or None if extraction failed
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return self.extract_metadata(file_path)
+        key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        
+        with self._metadata_lock:
+            info = self._metadata_cache.get(key)
+            if info is not None:
+                self._metadata_cache.move_to_end(key)
+                return info
+        
+        info = self.extract_metadata(file_path)
+        if info is not None:
+            with self._metadata_lock:
+                self._metadata_cache[key] = info
+                if len(self._metadata_cache) > self.METADATA_CACHE_SIZE:
+                    self._metadata_cache.popitem(last=False)
+        return info
+    
+    def _extract_video_frame(self, file_path) -> Optional[str]:
+        """
+        Extract a single JPEG frame at video_frame_time with ffmpeg.
+        
+        Returns:
+            Path to a temporary JPEG (caller deletes it) or None on failure
+        """
+        from pathlib import Path
+        import subprocess
+        import tempfile
+        
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            tmp_path = tmp.name
+        
+        cmd = [
+            'ffmpeg', '-y', '-ss', str(self.video_frame_time),
+            '-i', str(file_path),
+            '-vframes', '1', '-q:v', '2',
+            tmp_path
+        ]
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=30)
+            if result.returncode == 0:
+                return tmp_path
+        except Exception:
+            pass
+        
+        Path(tmp_path).unlink(missing_ok=True)
+        return None
+    
+    def _generate_images(self, image_path, result: MediaResult) -> None:
+        """
+        Fill result.thumbnail/preview (per auto_* settings) from one decode.
+        
+        The image is opened once and shared by both generators. Large JPEGs
+        are decoded at a reduced DCT scale (Pillow draft mode) that still
+        covers the preview size.
+        """
+        if not (self.auto_thumbnail or self.auto_preview):
+            return
+        try:
+            from PIL import Image
+            from .preview import PreviewService
+            
+            with Image.open(image_path) as img:
+                img.draft('RGB', (PreviewService.MAX_SIZE, PreviewService.MAX_SIZE))
+                img.load()
+                if self.auto_thumbnail:
+                    result.thumbnail = self.generate_thumbnail(img)
+                if self.auto_preview:
+                    result.preview = self.generate_preview(img)
+        except Exception:
+            return
+    
     def generate_thumbnail(self, file_path) -> Optional[bytes]:
-        """Generate thumbnail from image."""
+        """Generate thumbnail from an image path or open PIL Image."""
         try:
-            from .thumbnail import ThumbnailService
-            service = ThumbnailService()
-            return service.generate(file_path)
+            if self._thumbnail_service is None:
+                from .thumbnail import ThumbnailService
+                self._thumbnail_service = ThumbnailService()
+            return self._thumbnail_service.generate(file_path)
         except Exception:
             return None
     
     def generate_preview(self, file_path) -> Optional[bytes]:
-        """Generate preview from image."""
+        """Generate preview from an image path or open PIL Image."""
         try:
-            from .preview import PreviewService
-            service = PreviewService()
-            return service.generate(file_path)
+            if self._preview_service is None:
+                from .preview import PreviewService
+                self._preview_service = PreviewService()
+            return self._preview_service.generate(file_path)
         except Exception:
             return None
     
@@ -646,37 +790,15 @@ class MediaProcessor:
         
         Uses ffmpeg to extract a frame, then resizes to MEGA thumbnail spec.
         """
-        from .thumbnail import ThumbnailService
         from pathlib import Path
-        import subprocess
-        import tempfile
         
-        try:
-            # Extract frame at 1 second
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                tmp_path = tmp.name
-            
-            cmd = [
-                'ffmpeg', '-y', '-ss', str(self.video_frame_time),
-                '-i', str(file_path),
-                '-vframes', '1', '-q:v', '2',
-                tmp_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, timeout=30)
-            if result.returncode != 0:
-                return None
-            
-            # Resize to 240x240 for MEGA
-            service = ThumbnailService()
-            thumb_data = service.generate(tmp_path)
-            
-            # Cleanup
-            Path(tmp_path).unlink(missing_ok=True)
-            return thumb_data
-            
-        except Exception:
+        frame_path = self._extract_video_frame(file_path)
+        if not frame_path:
             return None
+        try:
+            return self.generate_thumbnail(frame_path)
+        finally:
+            Path(frame_path).unlink(missing_ok=True)
 
     async def generate_video_preview(self, file_path) -> Optional[bytes]:
         """
@@ -684,37 +806,15 @@ class MediaProcessor:
         
         Extracts a frame and resizes to MEGA preview spec (max 1024x1024, 85% quality).
         """
-        from .preview import PreviewService
         from pathlib import Path
-        import subprocess
-        import tempfile
         
-        try:
-            # Extract frame at 1 second
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                tmp_path = tmp.name
-            
-            cmd = [
-                'ffmpeg', '-y', '-ss', str(self.video_frame_time),
-                '-i', str(file_path),
-                '-vframes', '1', '-q:v', '2',
-                tmp_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, timeout=30)
-            if result.returncode != 0:
-                return None
-            
-            # Resize to max 1024px for MEGA preview
-            service = PreviewService()
-            preview_data = service.generate(tmp_path)
-            
-            # Cleanup
-            Path(tmp_path).unlink(missing_ok=True)
-            return preview_data
-            
-        except Exception:
+        frame_path = self._extract_video_frame(file_path)
+        if not frame_path:
             return None
+        try:
+            return self.generate_preview(frame_path)
+        finally:
+            Path(frame_path).unlink(missing_ok=True)
 
     
     @staticmethod
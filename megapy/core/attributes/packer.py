@@ -11,6 +11,26 @@ from typing import Dict, Any, Optional, Union
 from Crypto.Cipher import AES
 
 from .models import FileAttributes
+from ..crypto import aes_cbc_encrypt
+
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(attrs_dict: Dict[str, Any]) -> bytes:
+    """
+    Serialize attributes to compact UTF-8 JSON.
+    
+    orjson and the stdlib fallback produce identical bytes: no whitespace
+    and non-ASCII characters kept as UTF-8 (as the MEGA web client does).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(attrs_dict)
+    return json.dumps(attrs_dict, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
 
 
 class AttributesPacker:
@@ -45,20 +65,9 @@ class AttributesPacker:
             attrs_dict = attributes.to_dict()
         else:
             attrs_dict = attributes
-        # Convert to JSON
-        json_str = json.dumps(attrs_dict, separators=(',', ':'))
-        # Add MEGA prefix
-        data = AttributesPacker.PREFIX + json_str.encode('utf-8')
-        padding_len = (16 - (len(data) % 16)) % 16
-        if padding_len == 0:
-            padding_len = 16  # Always add some padding
-        data = data + (b'\x00' * padding_len)
         
         # Encrypt with AES-CBC
-        cipher = AES.new(key[:16], AES.MODE_CBC, iv=b'\x00' * 16)
-        encrypted = cipher.encrypt(data)
-        
-        return encrypted
+        return aes_cbc_encrypt(key[:16], AttributesPacker.pack_raw(attrs_dict))
     
     @staticmethod
     def unpack(
@@ -109,15 +118,11 @@ class AttributesPacker:
         Returns:
             Packed bytes (not encrypted)
         """
-        json_str = json.dumps(attrs_dict, separators=(',', ':'))
-        data = AttributesPacker.PREFIX + json_str.encode('utf-8')
-        
-        # Pad to 16-byte boundary
-        padding_len = (16 - (len(data) % 16)) % 16
-        if padding_len == 0:
-            padding_len = 16
+        data = AttributesPacker.PREFIX + _dump_json(attrs_dict)
         
-        return data + (b'\x00' * padding_len)
+        # Pad to 16-byte boundary. An aligned payload still gets a full
+        # block: readers cut the JSON at the first null byte.
+        return data + bytes(16 - len(data) % 16)
     
     @staticmethod
     def unpack_raw(data: bytes) -> Optional[Dict[str, Any]]:
@@ -33,6 +33,7 @@ class PreviewService:
     MAX_SIZE = 1024  # MEGA uses PREVIEW_SIZE: 1024
     QUALITY = 85     # MEGA uses PREVIEW_QUALITY: 0.85
     FORMAT = 'JPEG'
+    REDUCING_GAP = 3.0  # Pillow: output indistinguishable from a plain resize
     
     def __init__(self):
         if not PIL_AVAILABLE:
@@ -43,14 +44,14 @@ class PreviewService:
     
     def generate(
         self,
-        source: Union[str, Path, bytes, BinaryIO],
+        source: Union[str, Path, bytes, BinaryIO, Image.Image],
         max_size: Optional[int] = None
     ) -> bytes:
         """
         Generate a preview image.
         
         Args:
-            source: Image file path, bytes, or file-like object
+            source: Image file path, bytes, file-like object or open Image
             max_size: Maximum width/height (default: 1024)
             
         Returns:
@@ -137,7 +138,9 @@ class PreviewService:
         self,
         source: Union[str, Path, bytes, BinaryIO]
     ) -> Image.Image:
-        """Load image from various sources."""
+        """Load image from various sources (an open Image is used as-is)."""
+        if isinstance(source, Image.Image):
+            return source
         if isinstance(source, (str, Path)):
             return Image.open(source)
         elif isinstance(source, bytes):
@@ -164,7 +167,12 @@ class PreviewService:
             new_height = max_size
             new_width = int(width * (max_size / height))
         
-        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # reducing_gap box-reduces first, so LANCZOS only filters the last ~3x
+        return img.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=self.REDUCING_GAP
+        )
     
     def get_dimensions(
         self,
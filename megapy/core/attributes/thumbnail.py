@@ -31,14 +31,14 @@ class ThumbnailService:
     FORMAT = 'JPEG'
     def generate(
         self,
-        source: Union[str, Path, bytes, BinaryIO],
+        source: Union[str, Path, bytes, BinaryIO, Image.Image],
         crop_center: bool = True
     ) -> bytes:
         """
         Generate a thumbnail from an image.
         
         Args:
-            source: Image file path, bytes, or file-like object
+            source: Image file path, bytes, file-like object or open Image
             crop_center: If True, crop to center square before resize
             
         Returns:
@@ -75,6 +75,9 @@ class ThumbnailService:
             new_w = int(w * SIZE / h)
 
         img = img.resize((new_w, new_h), Image.Resampling.LANCZOS) """
+        if img is source:
+            # thumbnail() works in place; leave the caller's image intact
+            img = img.copy()
         img = OrientationFixer().fix_pil_image(img)
         img.thumbnail(self.SIZE)
         output = io.BytesIO()
@@ -139,7 +142,9 @@ class ThumbnailService:
         self,
         source: Union[str, Path, bytes, BinaryIO]
     ) -> Image.Image:
-        """Load image from various sources."""
+        """Load image from various sources (an open Image is used as-is)."""
+        if isinstance(source, Image.Image):
+            return source
         if isinstance(source, (str, Path)):
             return Image.open(source)
         elif isinstance(source, bytes):
@@ -1,4 +1,7 @@
 """Crypto module - refactored with SOLID principles and design patterns."""
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+
 from .utils import Base64Encoder, KeyManager
 from .aes import AESCrypto, EncryptionService, DecryptionService
 from .key_derivation import PasswordKeyDeriverV1, PasswordKeyDeriverV2
@@ -86,18 +89,30 @@ def decrypt_with_rsa(privk: bytes, t: str) -> bytes:
 # Import MPI helper (needed for RSA)
 from .rsa import mpi_to_int
 
-# Import AES helper functions (backward compatibility)
+# AES-CBC helpers with MEGA's zero IV, backed by OpenSSL (AES-NI)
+_ZERO_IV = b'\0' * 16
+
 def aes_cbc_encrypt(key, data):
-    """AES CBC encrypt (backward compatibility)."""
-    from Crypto.Cipher import AES
-    aes_cipher = AES.new(key, AES.MODE_CBC, b'\0' * 16)
-    return aes_cipher.encrypt(data)
+    """AES CBC encrypt with zero IV; data must be block-aligned."""
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(_ZERO_IV), backend=default_backend()).encryptor()
+    return encryptor.update(data) + encryptor.finalize()
 
 def aes_cbc_decrypt(data, key):
-    """AES CBC decrypt (backward compatibility)."""
-    from Crypto.Cipher import AES
-    aes_cipher = AES.new(key, AES.MODE_CBC, b'\0' * 16)
-    return aes_cipher.decrypt(data)
+    """AES CBC decrypt with zero IV; data must be block-aligned."""
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(_ZERO_IV), backend=default_backend()).decryptor()
+    return decryptor.update(data) + decryptor.finalize()
+
+def aes_cbc_decrypt_into(buffer, length, key):
+    """
+    AES CBC decrypt buffer[:length] in place with zero IV.
+    
+    length must be block-aligned and buffer needs 15 spare bytes past it
+    (cryptography's update_into output requirement).
+    """
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(_ZERO_IV), backend=default_backend()).decryptor()
+    with memoryview(buffer) as view:
+        decryptor.update_into(view[:length], buffer)
+    decryptor.finalize()
 
 # Export all functions for backward compatibility
 __all__ = [
@@ -128,6 +143,7 @@ __all__ = [
     'Base64',
     'aes_cbc_encrypt',
     'aes_cbc_decrypt',
+    'aes_cbc_decrypt_into',
     'unmerge_key_mac',
     'merge_key_mac',
     'mpi_to_int',
@@ -3,6 +3,9 @@ import asyncio
 from typing import Tuple, Optional
 from Crypto.Hash import CMAC
 from Crypto.Util import Counter
+from cryptography.hazmat.primitives.ciphers import Cipher, CipherContext, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+from .utils.key_utils import KeyManager
 
 
 def merge_key_mac(key: bytes, mac: bytes) -> bytes:
@@ -56,7 +59,7 @@ class MegaEncrypt:
         while len(self.mac_buffer) >= 16:
             block = bytes(self.mac_buffer[:16])
             # XOR con el bloque actual
-            self.mac = bytes(a ^ b for a, b in zip(self.mac, block))
+            self.mac = KeyManager.xor(self.mac, block)
             # Cifrar el MAC actual (AES-ECB)
             self.mac = self.mac_cipher.encrypt(self.mac)
             self.mac_buffer = self.mac_buffer[16:]
@@ -82,6 +85,42 @@ class MegaEncrypt:
         mac_condensed = self.mac[:4] + self.mac[8:12]
         return mac_condensed, self.key + mac_condensed
 
+
+def create_ctr_decryptor(key: bytes, position: int = 0) -> CipherContext:
+    """
+    Create a streaming AES-CTR decryptor for MEGA file data.
+    
+    Uses the OpenSSL backend from `cryptography`, which processes CTR
+    keystream in multi-block AES-NI batches. The returned context keeps its
+    counter state, so sequential chunks can be fed to update() without
+    rebuilding the cipher.
+    
+    Args:
+        key: File key (at least 24 bytes: 16 AES key + 8 nonce)
+        position: Byte position in the file to start decrypting at
+        
+    Returns:
+        Cipher context positioned at `position`
+    """
+    if len(key) < 24:
+        raise ValueError(f"Key too short: {len(key)} bytes, need at least 24")
+    
+    # 16-byte counter block: 8-byte nonce + 64-bit big-endian block index
+    counter_block = key[16:24] + (position // 16).to_bytes(8, 'big')
+    decryptor = Cipher(
+        algorithms.AES(key[:16]),
+        modes.CTR(counter_block),
+        backend=default_backend()
+    ).decryptor()
+    
+    # Skip keystream bytes before an unaligned position
+    offset_in_block = position % 16
+    if offset_in_block:
+        decryptor.update(bytes(offset_in_block))
+    
+    return decryptor
+
+
 class MegaDecrypt:
     """
     Decryption class that handles both decryption and MAC verification.
@@ -21,7 +21,7 @@ class StringHasher:
         
         for i in range(0, len(string), 16):
             block = string[i:i+16].ljust(16, b'\0')
-            h = bytes(a ^ b for a, b in zip(h, cipher.encrypt(block)))
+            h = KeyManager.xor(h, cipher.encrypt(block))
         
         return h
 
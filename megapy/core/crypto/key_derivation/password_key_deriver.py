@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from Crypto.Cipher import AES
 import hashlib
 from ..utils.encoding import Base64Encoder
+from ..utils.key_utils import KeyManager
 
 
 class PasswordKeyDeriver(ABC):
@@ -22,11 +23,16 @@ class PasswordKeyDeriverV1(PasswordKeyDeriver):
         if isinstance(password, str):
             password = password.encode()
         
+        # Key schedules don't change between rounds; build them once
+        ciphers = [
+            AES.new(password[j:j+16].ljust(16, b'\0'), AES.MODE_ECB)
+            for j in range(0, len(password), 16)
+        ]
+        
         pkey = b'\0' * 16
         for i in range(65536):
-            for j in range(0, len(password), 16):
-                key = password[j:j+16].ljust(16, b'\0')
-                pkey = bytes(a ^ b for a, b in zip(pkey, AES.new(key, AES.MODE_ECB).encrypt(pkey)))
+            for cipher in ciphers:
+                pkey = KeyManager.xor(pkey, cipher.encrypt(pkey))
         
         return pkey
 
@@ -1,5 +1,11 @@
 """Encoding utilities."""
-import base64
+# Optional SIMD base64 codec with the same API as the stdlib module
+try:
+    import pybase64 as base64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    import base64
+    PYBASE64_AVAILABLE = False
 
 
 class Base64Encoder:
@@ -17,10 +23,8 @@ class Base64Encoder:
     def decode(data: str) -> bytes:
         """Decodes Base64 URL-safe (with or without padding)."""
         data = data.replace('-', '+').replace('_', '/')
-        padding = len(data) % 4
-        if padding:
-            data += '=' * (4 - padding)
-        return base64.b64decode(data)
+        # (-n) & 3 is the number of '=' needed to reach a multiple of 4
+        return base64.b64decode(data + '==='[:-len(data) & 3])
     
 
 
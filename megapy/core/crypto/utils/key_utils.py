@@ -13,17 +13,16 @@ class KeyManager:
             return base64.b64decode(key)
         return key
     
+    @staticmethod
+    def xor(a: bytes, b: bytes) -> bytes:
+        """XORs two equal-length byte strings as one big integer."""
+        return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+    
     @staticmethod
     def unmerge_key_mac(merged_key: bytes) -> bytes:
         """Separates key and MAC from Mega's combined format."""
-        new_key = bytearray(32)
-        copy_len = min(len(merged_key), 32)
-        new_key[:copy_len] = merged_key[:copy_len]
-        
-        for i in range(16):
-            new_key[i] = new_key[i] ^ new_key[16 + i]
-        
-        return bytes(new_key)
+        new_key = bytes(merged_key[:32]).ljust(32, b'\0')
+        return KeyManager.xor(new_key[:16], new_key[16:]) + new_key[16:]
     
     @staticmethod
     def merge_key_mac(key: bytes, mac: bytes) -> bytes:
@@ -0,0 +1,13 @@
+"""
+Download module for MEGA file downloads.
+
+Provides helpers that keep network receive, decryption and disk writes
+from blocking each other.
+"""
+from .buffers import BufferPool
+from .writer import AsyncFileWriter
+
+__all__ = [
+    'AsyncFileWriter',
+    'BufferPool',
+]
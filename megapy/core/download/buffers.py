@@ -0,0 +1,51 @@
+"""
+Reusable buffer pool for downloads.
+
+Chunks are decrypted into pre-allocated bytearrays that are handed back to
+the pool once written, so the steady state of a download allocates no new
+output buffers.
+"""
+import asyncio
+
+
+class BufferPool:
+    """
+    Fixed set of reusable bytearrays.
+    
+    acquire() waits while every buffer is in use, which also bounds how much
+    decrypted data can be pending at once.
+    """
+    
+    def __init__(self, buffer_size: int, count: int):
+        """
+        Initialize buffer pool.
+        
+        Args:
+            buffer_size: Size of each buffer in bytes
+            count: Number of buffers to pre-allocate
+        """
+        if count < 1:
+            raise ValueError("Buffer pool needs at least one buffer")
+        
+        self._buffer_size = buffer_size
+        self._free: asyncio.Queue = asyncio.Queue()
+        for _ in range(count):
+            self._free.put_nowait(bytearray(buffer_size))
+    
+    @property
+    def buffer_size(self) -> int:
+        """Returns size of each buffer."""
+        return self._buffer_size
+    
+    @property
+    def available(self) -> int:
+        """Returns number of buffers not in use."""
+        return self._free.qsize()
+    
+    async def acquire(self) -> bytearray:
+        """Take a buffer from the pool, waiting if none is free."""
+        return await self._free.get()
+    
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool."""
+        self._free.put_nowait(buffer)
@@ -0,0 +1,99 @@
+"""
+Background file writer for downloads.
+
+Disk writes run in a separate task fed by a bounded queue, so the download
+loop can keep receiving and decrypting while the previous chunk is written.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Union
+import aiofiles
+
+from .buffers import BufferPool
+
+
+class AsyncFileWriter:
+    """
+    Asynchronous file writer backed by a bounded queue.
+    
+    Use as an async context manager: write() enqueues data and returns as
+    soon as there is room in the queue, while a background task drains it
+    into the file through aiofiles. Leaving the context flushes pending
+    chunks and closes the file.
+    
+    Example:
+        >>> async with AsyncFileWriter(dest) as writer:
+        ...     async for chunk in response.content.iter_chunked(size):
+        ...         await writer.write(chunk)
+    """
+    
+    DEFAULT_MAX_PENDING = 8
+    
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        max_pending: int = DEFAULT_MAX_PENDING,
+        pool: Optional[BufferPool] = None
+    ):
+        """
+        Initialize file writer.
+        
+        Args:
+            file_path: Destination file path
+            max_pending: Maximum chunks buffered before write() waits
+            pool: Optional pool that pooled buffers are returned to once written
+        """
+        self._file_path = Path(file_path)
+        self._pool = pool
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self._logger = logging.getLogger('megapy.download.writer')
+    
+    async def __aenter__(self) -> 'AsyncFileWriter':
+        file_handle = await aiofiles.open(self._file_path, 'wb')
+        self._task = asyncio.create_task(self._drain(file_handle))
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # None signals EOF to the drain task
+        await self._queue.put(None)
+        await self._task
+        if self._error is not None and exc_type is None:
+            raise self._error
+    
+    async def write(self, data: bytes, buffer: Optional[bytearray] = None) -> None:
+        """
+        Queue data to be written.
+        
+        Args:
+            data: Bytes (or a memoryview) to append to the file
+            buffer: Pooled buffer backing `data`, released after the write
+            
+        Raises:
+            OSError: If a previous write failed
+        """
+        if self._error is not None:
+            raise self._error
+        await self._queue.put((data, buffer))
+    
+    async def _drain(self, file_handle) -> None:
+        """Write queued chunks until EOF, then close the file."""
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                data, buffer = item
+                if self._error is None:
+                    try:
+                        await file_handle.write(data)
+                    except (IOError, OSError) as e:
+                        # Keep draining so writers blocked on put() can proceed
+                        self._logger.error(f"Failed to write to {self._file_path}: {e}")
+                        self._error = e
+                if buffer is not None and self._pool is not None:
+                    self._pool.release(buffer)
+        finally:
+            await file_handle.close()
@@ -1,8 +1,8 @@
 """Centralized key decryption for MEGA nodes."""
 import json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from Crypto.Cipher import AES
-from ..crypto import Base64Encoder, unmerge_key_mac, merge_key_mac
+from ..crypto import Base64Encoder, KeyManager, unmerge_key_mac, merge_key_mac
 from megapy.core.attributes.packer import AttributesPacker
 
 
@@ -46,6 +46,48 @@ class KeyDecryptor:
         except Exception:
             return None
     
+    def decrypt_node_keys(
+        self,
+        nodes: List[Dict[str, Any]],
+        master_key: bytes
+    ) -> List[Optional[bytes]]:
+        """
+        Decrypt the keys of many nodes with a single ECB call.
+        
+        ECB blocks are independent, so decrypting the concatenated keys and
+        slicing them back gives the same result as decrypt_node_key() per
+        node, without a cipher object and a C call per node.
+        
+        Returns:
+            One key (or None) per input node, in order
+        """
+        keys: List[Optional[bytes]] = [None] * len(nodes)
+        encrypted = []
+        spans = []
+        
+        for index, node in enumerate(nodes):
+            key_str = node.get('k', '')
+            if not key_str or ':' not in key_str:
+                continue
+            try:
+                blob = self._encoder.decode(key_str.split(':', 1)[1])
+            except Exception:
+                continue
+            # Not block aligned: decrypt_node_key() would fail on it too
+            if len(blob) % 16:
+                continue
+            encrypted.append(blob)
+            spans.append((index, len(blob)))
+        
+        if encrypted:
+            decrypted = AES.new(master_key, AES.MODE_ECB).decrypt(b''.join(encrypted))
+            offset = 0
+            for index, length in spans:
+                keys[index] = decrypted[offset:offset + length]
+                offset += length
+        
+        return keys
+    
     def get_file_key(self, full_key: bytes) -> bytes:
         """
         Get 16-byte file key for AES encryption/decryption.
@@ -54,7 +96,7 @@ class KeyDecryptor:
         For 16-byte keys, returns as-is.
         """
         if len(full_key) >= 32:
-            return bytes(a ^ b for a, b in zip(full_key[:16], full_key[16:32]))
+            return KeyManager.xor(full_key[:16], full_key[16:32])
         return full_key[:16]
     
     def decrypt_attributes(
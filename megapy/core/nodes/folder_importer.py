@@ -168,18 +168,7 @@ class FolderImporter:
         Returns:
             List of all nodes (folder + all children recursively)
         """
-        nodes = [folder]
-        
-        def collect_children(node: Node):
-            """Recursively collect children."""
-            for child in node.children:
-                print(child)
-                nodes.append(child)
-                if child.is_folder:
-                    collect_children(child)
-        
-        collect_children(folder)
-        return nodes
+        return list(folder.walk(include_self=True))
     
     def _prepare_nodes_for_import(
         self,
@@ -280,7 +269,7 @@ class FolderImporter:
                 try:
                     if node.key:
                         decrypted = AttributesPacker.unpack(
-                            Base64Encoder().decode(raw_attrs),
+                            Base64Encoder.decode(raw_attrs),
                             node.key[:16]
                         )
                         if decrypted:
@@ -322,7 +311,7 @@ class FolderImporter:
         encrypted = cipher.encrypt(key)
         
         # Convert to base64
-        return Base64Encoder().encode(encrypted)
+        return Base64Encoder.encode(encrypted)
     
     async def _execute_import(
         self,
@@ -1,5 +1,6 @@
 """Centralized key decryption for MEGA nodes."""
 import json
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
 from Crypto.Cipher import AES
 from megapy.core.utils import b64encode, b64decode
@@ -8,6 +9,13 @@ from megapy.core.crypto.aes import AESCrypto
 from megapy.core.crypto import unmerge_key_mac, merge_key_mac
 
 
+@lru_cache(maxsize=64)
+def _ecb_cipher(key: bytes):
+    """Get an AES-ECB cipher for `key`, expanding its key schedule once."""
+    # ECB objects keep no state between calls, so one can serve every node
+    return AES.new(key, AES.MODE_ECB)
+
+
 class KeyFileManager:
     """
     Single source of truth for key decryption.
@@ -69,8 +77,7 @@ class KeyFileManager:
         """Decrypt key from MEGA API response."""
         _, encrypted_b64 = key_str.split(':', 1)
         encrypted = b64decode(encrypted_b64)
-        decrypted = AESCrypto(master_key).decrypt_ecb(encrypted)
-        return decrypted
+        return _ecb_cipher(master_key).decrypt(encrypted)
     
     
     @property
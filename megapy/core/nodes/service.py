@@ -33,6 +33,7 @@ class NodeService:
         self._root: Optional[Node] = None
         self._root_handle: Optional[str] = None
         self._raw_f: Optional[List[Dict[str, Any]]] = None  # Raw "f" array from API
+        self._name_index: Optional[Dict[str, List[Node]]] = None  # Built on first name lookup
     
     @property
     def root(self) -> Optional[Node]:
@@ -60,10 +61,14 @@ class NodeService:
         
         self._nodes.clear()
         self._root = None
+        self._name_index = None
+        
+        # Full keys (32 bytes for files), decrypted in one batch
+        keys = self._decryptor.decrypt_node_keys(nodes_data, self._master_key)
         
         # First pass: create all nodes
-        for data in nodes_data:
-            node = self._create_node(data)
+        for data, key in zip(nodes_data, keys):
+            node = self._create_node(data, key)
             if node:
                 self._nodes[node.handle] = node
         
@@ -113,8 +118,8 @@ class NodeService:
         # Use existing load logic
         return self.load(api_response)
     
-    def _create_node(self, data: Dict[str, Any]) -> Optional[Node]:
-        """Create a single node from API data."""
+    def _create_node(self, data: Dict[str, Any], key: Optional[bytes]) -> Optional[Node]:
+        """Create a single node from API data and its decrypted key."""
         try:
             handle = data.get('h', '')
             node_type = data.get('t', 0)
@@ -123,9 +128,6 @@ class NodeService:
             if node_type in (self.NODE_TYPE_INBOX, self.NODE_TYPE_TRASH):
                 return None
             
-            # Decrypt key (full 32 bytes for files)
-            key = self._decryptor.decrypt_node_key(data, self._master_key)
-            
             # Decrypt attributes
             attrs = self._decryptor.decrypt_attributes(data, key)
             
@@ -163,10 +165,21 @@ class NodeService:
     
     def find_by_name(self, name: str) -> Optional[Node]:
         """Find first node matching name."""
-        for node in self._nodes.values():
-            if node.name == name:
-                return node
-        return None
+        matches = self._names().get(name)
+        return matches[0] if matches else None
+    
+    def find_all_by_name(self, name: str) -> List[Node]:
+        """Find all nodes matching name, in load order."""
+        return list(self._names().get(name, ()))
+    
+    def _names(self) -> Dict[str, List[Node]]:
+        """Name -> nodes index, built once and kept current by add/remove/rename."""
+        if self._name_index is None:
+            index: Dict[str, List[Node]] = {}
+            for node in self._nodes.values():
+                index.setdefault(node.name, []).append(node)
+            self._name_index = index
+        return self._name_index
     
     def find_by_path(self, path: str) -> Optional[Node]:
         """Find node by path from root."""
@@ -199,8 +212,13 @@ class NodeService:
         if not node or not node.handle:
             return
         
-        # Add to nodes dictionary
+        # Add to nodes dictionary (a replaced node leaves the name index)
+        previous = self._nodes.get(node.handle)
+        if previous is not None:
+            self._unindex(previous)
         self._nodes[node.handle] = node
+        if self._name_index is not None:
+            self._name_index.setdefault(node.name, []).append(node)
         
         # Update parent-child relationship if parent exists
         if node.parent_handle:
@@ -208,4 +226,44 @@ class NodeService:
             if parent_node:
                 node.parent = parent_node
                 if node not in parent_node.children:
-                    parent_node.children.append(node)
\ No newline at end of file
+                    parent_node.children.append(node)
+    
+    def remove_node(self, handle: str) -> Optional[Node]:
+        """
+        Remove a node and everything below it from the tree.
+        
+        Args:
+            handle: Handle of the node to remove
+            
+        Returns:
+            The removed node, or None if it wasn't loaded
+        """
+        node = self._nodes.get(handle)
+        if node is None:
+            return None
+        
+        # A deleted folder takes its descendants with it
+        for removed in node.walk(include_self=True):
+            self._nodes.pop(removed.handle, None)
+            self._unindex(removed)
+        if node.parent:
+            # Identity, not dataclass equality (which walks parents/children)
+            node.parent.children[:] = [c for c in node.parent.children if c is not node]
+        return node
+    
+    def rename_node(self, node: Node, new_name: str) -> None:
+        """Set a node's name and move it in the name index."""
+        self._unindex(node)
+        node.name = new_name
+        if self._name_index is not None and node.handle in self._nodes:
+            self._name_index.setdefault(new_name, []).append(node)
+    
+    def _unindex(self, node: Node) -> None:
+        """Drop a node from the name index."""
+        if self._name_index is None:
+            return
+        matches = self._name_index.get(node.name)
+        if matches:
+            matches[:] = [n for n in matches if n is not node]
+            if not matches:
+                del self._name_index[node.name]
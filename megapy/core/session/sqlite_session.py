@@ -34,6 +34,15 @@ class SQLiteSession(SessionStorage):
     EXTENSION = '.session'
     SCHEMA_VERSION = 1
     
+    # Applied to every new connection. WAL lets readers proceed while a
+    # write is in progress; with WAL, synchronous=NORMAL only fsyncs at
+    # checkpoints instead of on every commit.
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+    )
+    
     def __init__(
         self,
         session_name: Union[str, Path],
@@ -79,6 +88,8 @@ class SQLiteSession(SessionStorage):
                     check_same_thread=False
                 )
                 self._conn.row_factory = sqlite3.Row
+                for pragma in self.PRAGMAS:
+                    self._conn.execute(pragma)
             yield self._conn
     
     def _init_db(self) -> None:
@@ -230,6 +241,9 @@ class SQLiteSession(SessionStorage):
         self.close()
         if self._path.exists():
             self._path.unlink()
+        # WAL side files (normally removed when the last connection closes)
+        for suffix in ('-wal', '-shm'):
+            Path(f"{self._path}{suffix}").unlink(missing_ok=True)
     
     def get_cache(self, key: str) -> Optional[Any]:
         """
@@ -242,12 +256,11 @@ class SQLiteSession(SessionStorage):
             Cached value or None
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            # sqlite3 keeps compiled statements in a per-connection cache
+            row = conn.execute(
                 'SELECT value FROM cache WHERE key = ?',
                 (key,)
-            )
-            row = cursor.fetchone()
+            ).fetchone()
             if row is None:
                 return None
             try:
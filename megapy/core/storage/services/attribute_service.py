@@ -36,17 +36,11 @@ class AttributeService:
     
     def encrypt(self, attr: Dict[str, Any], key: bytes, node_type: int) -> str:
         """Encrypts node attributes."""
+        from ...attributes.packer import AttributesPacker
         key_16 = self.key_manager.unmerge_key_mac(key)[:16]
         
         raw_attrs = self.unparse(attr)
-        attr_bytes = ('MEGA' + json.dumps(raw_attrs)).encode('utf-8')
-        
-        if len(attr_bytes) % 16:
-            attr_bytes += b'\0' * (16 - len(attr_bytes) % 16)
-        
-        aes = AES.new(key_16, AES.MODE_CBC, b'\0' * 16)
-        encrypted_attr = aes.encrypt(attr_bytes)
-        return self.encoder.encode(encrypted_attr)
+        return self.encoder.encode(AttributesPacker.pack(raw_attrs, key_16))
     
     def parse(self, attr: Dict[str, Any]) -> Dict[str, Any]:
         """Converts from MEGA internal format to friendly format."""
@@ -8,6 +8,7 @@ import logging
 import asyncio
 import aiohttp
 import time
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Callable
 from Crypto.Cipher import AES
@@ -40,6 +41,9 @@ class UploadCoordinator:
     Supports both sync and async API clients.
     """
     
+    PROGRESS_MIN_BYTES = 4 * 1024 * 1024  # Report progress at most every 4 MiB...
+    PROGRESS_MIN_INTERVAL = 0.5  # ...or every 0.5 seconds
+    
     def __init__(
         self,
         api_client: AsyncAPIClient,
@@ -48,7 +52,8 @@ class UploadCoordinator:
         encryption_strategy: Optional[EncryptionStrategy] = None,
         file_reader: Optional[FileReaderProtocol] = None,
         logger: Optional[LoggerProtocol] = None,
-        progress_callback: Optional[Callable[[UploadProgress], None]] = None
+        progress_callback: Optional[Callable[[UploadProgress], None]] = None,
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize upload coordinator.
@@ -61,6 +66,7 @@ class UploadCoordinator:
             file_reader: File reader implementation
             logger: Logger instance
             progress_callback: Optional callback for progress updates
+            session: Optional shared session for file attribute uploads
         """
         self._api = api_client
         self._master_key = master_key
@@ -68,6 +74,7 @@ class UploadCoordinator:
         self._file_reader = file_reader or AsyncFileReader()
         self._validator = FileValidator()
         self._progress_callback = progress_callback
+        self._session = session
         
         # Encryption strategy can be set per-upload
         self._default_encryption = encryption_strategy
@@ -86,7 +93,12 @@ class UploadCoordinator:
             FileNotFoundError: If file doesn't exist
             ValueError: If upload fails
         """
-        path, file_size = self._validator.validate(config.file_path)
+        if config.file_size is not None:
+            # Caller already stat'ed the file, skip re-validating it
+            path, file_size = config.file_path, config.file_size
+            self._validator.validate_size(file_size)
+        else:
+            path, file_size = self._validator.validate(config.file_path)
         file_size_mb = file_size / (1024 * 1024)
         logger.info(f"Starting upload: {path.name} ({file_size_mb:.2f} MB)")
         
@@ -150,6 +162,16 @@ class UploadCoordinator:
             logger.error(f"Total chunks: {len(chunks)}, File size: {file_size} bytes")
             raise ValueError("No upload token received - chunks may not have uploaded successfully")
         
+        # Step 6.5: Collect thumbnail/preview/media info generated during the transfer
+        if config.pending_media is not None:
+            thumbnail, preview, media_info = await config.pending_media
+            if config.thumbnail is None:
+                config.thumbnail = thumbnail
+            if config.preview is None:
+                config.preview = preview
+            if config.media_info is None:
+                config.media_info = media_info
+        
         # Step 7: Upload thumbnail and preview (if provided) in parallel
         # Use first 16 bytes of ORIGINAL key (not file_key) for encryption
         file_attributes = []
@@ -283,21 +305,26 @@ class UploadCoordinator:
         
         upload_url = result['p']
         
-        encoder = Base64Encoder()
-        connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30, force_close=False)
         timeout = aiohttp.ClientTimeout(total=60, connect=10)
         
-        upload_start = time.time()
+        # Reuse the caller's pooled connections when given a session
+        if self._session is not None:
+            session_context = nullcontext(self._session)
+        else:
+            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30, force_close=False)
+            session_context = aiohttp.ClientSession(connector=connector)
         
+        upload_start = time.time()
         
         logger.debug(f"Uploading {attr_name} to {upload_url}/{attr_type}")
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async with session_context as session:
             async with session.post(
                 f"{upload_url}/{attr_type}",
                 data=encrypted,
                 headers={'Content-Type': 'application/octet-stream'},
-                ssl=False
+                ssl=False,
+                timeout=timeout
             ) as resp:
                 if resp.status != 200:
                     upload_time = time.time() - upload_start
@@ -306,7 +333,7 @@ class UploadCoordinator:
                 response_bytes = await resp.read()
                 upload_time = time.time() - upload_start
                 if response_bytes:
-                    hash_result = encoder.encode(response_bytes)
+                    hash_result = Base64Encoder.encode(response_bytes)
                     logger.debug(f"{attr_name} uploaded successfully in {upload_time:.2f}s")
                     return hash_result
                 else:
@@ -364,6 +391,8 @@ class UploadCoordinator:
         active_uploads: set = set()
         chunks_completed = 0
         chunk_index = 0  # Track which chunk we're processing
+        reported_bytes = 0
+        last_report = time.monotonic()
         
         total_mb = total_bytes / (1024 * 1024)
         logger.info(f"Processing {total} chunks ({total_mb:.2f} MB total, max {max_parallel_uploads} parallel uploads)")
@@ -394,8 +423,10 @@ class UploadCoordinator:
                     if not data:
                         raise ValueError(f"Failed to read chunk {i}")
                     
-                    # 2. Encrypt chunk
-                    encrypted = encryption.encrypt_chunk(i, data)
+                    # 2. Encrypt chunk in a worker thread: encrypt_chunk() can block on
+                    # the MAC queue, and in-flight uploads keep sending meanwhile.
+                    # Awaiting it here still keeps CTR encryption in chunk order.
+                    encrypted = await asyncio.to_thread(encryption.encrypt_chunk, i, data)
                     
                     # 3. Explicitly release reference to unencrypted data immediately
                     # This is critical to prevent memory accumulation
@@ -424,9 +455,14 @@ class UploadCoordinator:
                     progress.uploaded_chunks = chunk_index
                     progress.uploaded_bytes = uploaded_bytes
                     
-                    # Callback if provided
+                    # Callback if provided, coalesced by bytes and time (always on the last chunk)
                     if self._progress_callback:
-                        self._progress_callback(progress)
+                        now = time.monotonic()
+                        if (chunk_index == total
+                                or uploaded_bytes - reported_bytes >= self.PROGRESS_MIN_BYTES
+                                or now - last_report >= self.PROGRESS_MIN_INTERVAL):
+                            self._progress_callback(progress)
+                            reported_bytes, last_report = uploaded_bytes, now
                 
                 # Wait for at least one upload to complete before reading more chunks
                 # This ensures we don't accumulate too many chunks in memory
@@ -4,7 +4,7 @@ Data models for upload module.
 Uses dataclasses for immutable, type-safe data structures.
 """
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, Union
+from typing import Awaitable, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 
 # Re-export FileAttributes from attributes module (single source of truth)
@@ -51,6 +51,10 @@ class UploadConfig:
         mega_id: ID linking to MongoDB (stored as 'm' attribute)
         media_info: Optional media metadata for video/audio files
         replace_handle: Optional handle of existing file to replace (creates new version)
+        file_size: Optional size in bytes when the caller already stat'ed the file
+        pending_media: Optional awaitable resolving to (thumbnail, preview, media_info);
+            awaited once the file data is uploaded, so media work overlaps the transfer.
+            Its values only fill fields that are still None.
     """
     file_path: Path
     target_folder_id: str
@@ -65,6 +69,8 @@ class UploadConfig:
     mega_id: Optional[str] = None
     media_info: Optional[Any] = None
     replace_handle: Optional[str] = None
+    file_size: Optional[int] = None
+    pending_media: Optional[Awaitable[Tuple[Optional[bytes], Optional[bytes], Optional[Any]]]] = None
     
     def __post_init__(self):
         """Validate and normalize config."""
@@ -1,11 +1,12 @@
 """Upload services module."""
-from .file_service import FileValidator, AsyncFileReader
+from .file_service import FileValidator, AsyncFileReader, MmapFileReader
 from .chunk_service import ChunkUploader
 from .node_service import NodeCreator
 
 __all__ = [
     'FileValidator',
     'AsyncFileReader',
+    'MmapFileReader',
     'ChunkUploader',
     'NodeCreator',
 ]
@@ -1,17 +1,10 @@
-import base64
+from .crypto.utils.encoding import Base64Encoder
 
 
 def b64encode(data: bytes) -> str:
     """Encodes bytes to Base64 URL-safe without padding."""
-    encoded = base64.b64encode(data).decode()
-    encoded = encoded.replace('+', '-').replace('/', '_')
-    encoded = encoded.rstrip('=')
-    return encoded
+    return Base64Encoder.encode(data)
 
 def b64decode(data: str) -> bytes:
     """Decodes Base64 URL-safe (with or without padding)."""
-    data = data.replace('-', '+').replace('_', '/')
-    padding = len(data) % 4
-    if padding:
-        data += '=' * (4 - padding)
-    return base64.b64decode(data)
\ No newline at end of file
+    return Base64Encoder.decode(data)
\ No newline at end of file
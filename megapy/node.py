@@ -10,7 +10,10 @@ if TYPE_CHECKING:
     from .core.attributes.models import FileAttributes
 
 
-@dataclass
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@dataclass(slots=True)
 class Node:
     """
     Unified representation of a file or folder in MEGA.
@@ -53,11 +56,9 @@ class Node:
     
     def _format_size(self) -> str:
         size = self.size
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} PB"
+        # Each unit is 10 more bits; PB absorbs anything larger
+        index = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
     
     # =========================================================================
     # Properties
@@ -291,10 +292,17 @@ class Node:
     def walk(self, include_self: bool = False) -> Iterator[Node]:
         if include_self:
             yield self
-        for child in self.children:
-            yield child
-            if child.is_folder:
-                yield from child.walk()
+        # Explicit stack: deep trees don't hit the recursion limit or
+        # pay a generator frame per level for every yielded node
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if child.is_folder:
+                    stack.append(iter(child.children))
+                    break
+            else:
+                stack.pop()
     
     def all_files(self) -> List[Node]:
         return [n for n in self.walk() if n.is_file]
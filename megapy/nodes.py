@@ -21,6 +21,9 @@ if TYPE_CHECKING:
     from .client import MegaClient
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 @dataclass
 class MegaNode:
     """
@@ -119,11 +122,9 @@ class MegaNode:
     def size_formatted(self) -> str:
         """Get human-readable size."""
         size = self.size
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} PB"
+        # Each unit is 10 more bits; PB absorbs anything larger
+        index = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
     
     @property
     def label(self) -> int:
@@ -532,25 +533,31 @@ class MegaNode:
             List of matching nodes
         """
         import fnmatch
+        import re
         
-        results = []
+        # Compile each part once instead of matching the pattern per node
+        *folder_parts, last_part = [
+            re.compile(fnmatch.translate(part)).match for part in pattern.split('/')
+        ]
         
-        # Simple pattern (no /)
-        if '/' not in pattern:
-            for child in self.children:
-                if fnmatch.fnmatch(child.name, pattern):
-                    results.append(child)
-                if child.is_folder:
-                    results.extend(child.glob(pattern))
-        else:
-            # Path pattern
-            parts = pattern.split('/', 1)
-            for child in self.children:
-                if fnmatch.fnmatch(child.name, parts[0]):
-                    if len(parts) == 1:
+        # Leading parts select folders one level at a time
+        folders = [self]
+        for match in folder_parts:
+            folders = [c for f in folders for c in f.children if c.is_folder and match(c.name)]
+        
+        # The last part matches at any depth below those folders (pre-order)
+        results = []
+        for folder in folders:
+            stack = [iter(folder.children)]
+            while stack:
+                for child in stack[-1]:
+                    if last_part(child.name):
                         results.append(child)
-                    elif child.is_folder:
-                        results.extend(child.glob(parts[1]))
+                    if child.is_folder:
+                        stack.append(iter(child.children))
+                        break
+                else:
+                    stack.pop()
         
         return results
     
@@ -682,6 +689,7 @@ class MegaNodeBuilder:
         encoder: Base64Encoder
     ) -> Optional[bytes]:
         """Decrypt node key."""
+        from .core.crypto import KeyManager
         try:
             key_str = node_data.get('k', '')
             if not key_str or ':' not in key_str:
@@ -696,7 +704,7 @@ class MegaNodeBuilder:
                 # File key: decrypt and XOR the two halves
                 decrypted = cipher.decrypt(encrypted_key)
                 # XOR first 16 bytes with last 16 bytes to get actual key
-                key = bytes(a ^ b for a, b in zip(decrypted[:16], decrypted[16:]))
+                key = KeyManager.xor(decrypted[:16], decrypted[16:])
                 return key
             elif len(encrypted_key) == 16:
                 # Folder key: just decrypt
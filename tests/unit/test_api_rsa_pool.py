@@ -0,0 +1,54 @@
+"""Tests for the pre-generated RSA key pool."""
+import pytest
+
+from megapy.core.api import RSAKeyPool
+
+
+class TestRSAKeyPool:
+    """Test suite for RSAKeyPool."""
+
+    def test_rejects_empty_pool(self):
+        """Test a pool needs room for at least one key."""
+        with pytest.raises(ValueError):
+            RSAKeyPool(size=0)
+
+    @pytest.mark.asyncio
+    async def test_get_key_returns_usable_key_and_refills(self):
+        """Test a handed-out key is valid and a replacement is started."""
+        pool = RSAKeyPool(size=1, bits=1024, refill=True)
+        try:
+            key = await pool.get_key()
+
+            assert key.size_in_bits() == 1024
+            assert key.has_private()
+            assert pow(pow(42, key.e, key.n), key.d, key.n) == 42
+            assert len(pool._pending) == 1
+        finally:
+            pool.shutdown()
+
+        assert not pool._pending
+
+    @pytest.mark.asyncio
+    async def test_pool_generates_only_on_request(self):
+        """Test a pool starts no processes until used and doesn't refill by default."""
+        pool = RSAKeyPool(size=1, bits=1024)
+        assert pool._executor is None
+        try:
+            await pool.get_key()
+
+            assert not pool._pending
+        finally:
+            pool.shutdown()
+
+    def test_concurrent_takes_get_distinct_keys(self):
+        """Test threads sharing a pool never pop the same or a missing key."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = RSAKeyPool(size=1, bits=1024)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as threads:
+                futures = list(threads.map(lambda _: pool._take(), range(8)))
+
+            assert len(set(map(id, futures))) == 8
+        finally:
+            pool.shutdown()
@@ -0,0 +1,1062 @@
+"""Tests for MegaClient helpers that don't require a MEGA account."""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from Crypto.Random import get_random_bytes
+
+from megapy.client import MegaClient, UserInfo, AccountInfo
+from megapy.core.crypto.file import MegaEncrypt
+from megapy.core.download import AsyncFileWriter
+from megapy.core.nodes import NodeService
+from megapy.node import Node
+
+
+class TestMediaServices:
+    """Test suite for shared media service instances."""
+
+    def test_media_processor_is_shared(self):
+        """Test the media processor is created once and reused."""
+        first = MegaClient()._get_media_processor()
+        second = MegaClient()._get_media_processor()
+
+        assert first is second
+
+    def test_thumbnail_and_preview_services_are_shared(self):
+        """Test thumbnail/preview services are created once and reused."""
+        client = MegaClient()
+
+        assert client._get_thumbnail_service() is client._get_thumbnail_service()
+        assert client._get_preview_service() is client._get_preview_service()
+
+
+class TestStorageInfo:
+    """Test suite for UserInfo/AccountInfo storage helpers."""
+
+    def test_usage_percent(self):
+        """Test usage percentage calculation."""
+        info = UserInfo(user_id='u', email='e', name='n', total_storage=200, used_storage=50)
+
+        assert info.usage_percent == 25.0
+
+    def test_usage_percent_with_zero_total(self):
+        """Test zero total storage doesn't divide by zero."""
+        info = UserInfo(user_id='u', email='e', name='n')
+
+        assert info.usage_percent == 0.0
+
+    def test_space_used_percent(self):
+        """Test account space percentage calculation."""
+        info = AccountInfo(account_type=0, space_used=25, space_total=100)
+
+        assert info.space_used_percent == 25.0
+        assert AccountInfo(account_type=0, space_used=0, space_total=0).space_used_percent == 0.0
+
+
+@pytest.fixture
+def loaded_client():
+    """Create a client with an in-memory node tree (no network)."""
+    client = MegaClient()
+    client._master_key = b'\x00' * 16
+    service = NodeService(client._master_key, client)
+    root = Node(handle='root', name='Cloud Drive', is_folder=True)
+    service._root = root
+    service._root_handle = 'root'
+    service._nodes['root'] = root
+    service.add_node(Node(handle='docs', name='Documents', is_folder=True, parent_handle='root'))
+    service.add_node(Node(handle='rep', name='report.pdf', size=10, parent_handle='docs'))
+    client._node_service = service
+    return client
+
+
+class TestNavigation:
+    """Test suite for cd()/pwd() navigation."""
+
+    @pytest.mark.asyncio
+    async def test_cd_absolute_and_relative(self, loaded_client):
+        """Test absolute and relative cd."""
+        node = await loaded_client.cd("/Documents")
+        assert node.handle == 'docs'
+
+        node = await loaded_client.cd("..")
+        assert node.handle == 'root'
+
+        node = await loaded_client.cd("Documents")
+        assert node.handle == 'docs'
+        assert loaded_client.pwd() == "/Documents"
+
+    @pytest.mark.asyncio
+    async def test_cd_root(self, loaded_client):
+        """Test cd to root."""
+        await loaded_client.cd("/Documents")
+        node = await loaded_client.cd("/")
+
+        assert node.handle == 'root'
+        assert loaded_client.pwd() == "/"
+
+    @pytest.mark.asyncio
+    async def test_cd_missing_path_raises(self, loaded_client):
+        """Test cd to missing path raises and keeps current directory."""
+        await loaded_client.cd("/Documents")
+
+        with pytest.raises(FileNotFoundError):
+            await loaded_client.cd("missing")
+
+        assert loaded_client.pwd() == "/Documents"
+
+
+class TestFind:
+    """Test suite for find()/find_all() name lookups."""
+
+    @pytest.mark.asyncio
+    async def test_find_all_returns_every_match(self, loaded_client):
+        """Test find() returns the first match and find_all() every match."""
+        service = loaded_client._node_service
+        service.add_node(Node(handle='rep2', name='report.pdf', parent_handle='root'))
+
+        assert (await loaded_client.find('report.pdf')).handle == 'rep'
+        assert [n.handle for n in await loaded_client.find_all('report.pdf')] == ['rep', 'rep2']
+        assert await loaded_client.find_all('missing') == []
+
+    @pytest.mark.asyncio
+    async def test_index_follows_add_rename_and_remove(self, loaded_client):
+        """Test the name index stays current after the tree changes."""
+        service = loaded_client._node_service
+        assert await loaded_client.find('Documents') is not None  # Builds the index
+
+        service.add_node(Node(handle='new', name='new.txt', parent_handle='root'))
+        service.rename_node(service.get('rep'), 'old.pdf')
+
+        assert (await loaded_client.find('new.txt')).handle == 'new'
+        assert (await loaded_client.find('old.pdf')).handle == 'rep'
+        assert await loaded_client.find('report.pdf') is None
+
+        service.remove_node('new')
+
+        assert await loaded_client.find('new.txt') is None
+        assert [n.handle for n in service.root.children] == ['docs']
+
+    @pytest.mark.asyncio
+    async def test_removing_folder_removes_descendants(self, loaded_client):
+        """Test removing a folder drops everything below it from nodes and the index."""
+        service = loaded_client._node_service
+        assert await loaded_client.find('report.pdf') is not None  # Builds the index
+
+        service.remove_node('docs')
+
+        assert await loaded_client.find('report.pdf') is None
+        assert await loaded_client.find_all('report.pdf') == []
+        assert await loaded_client.find('Documents') is None
+        assert service.get('rep') is None and service.get('docs') is None
+        assert service.root.children == []
+
+
+class TestNodeTree:
+    """Test suite for Node tree helpers."""
+
+    def test_walk_is_preorder(self, loaded_client):
+        """Test walk() yields each folder before its contents."""
+        root = loaded_client._node_service.root
+
+        assert [n.handle for n in root.walk(include_self=True)] == ['root', 'docs', 'rep']
+
+    def test_walk_handles_deep_trees(self):
+        """Test walk() doesn't hit the recursion limit on deeply nested folders."""
+        root = current = Node(handle='f0', name='f0', is_folder=True)
+        for i in range(1, 3000):
+            child = Node(handle=f'f{i}', name=f'f{i}', is_folder=True, parent=current)
+            current.children.append(child)
+            current = child
+
+        assert sum(1 for _ in root.walk()) == 2999
+
+
+    def test_format_size_units(self):
+        """Test sizes are scaled to the largest unit below 1024."""
+        assert Node(handle='a', name='a', size=0)._format_size() == "0.0 B"
+        assert Node(handle='a', name='a', size=1023)._format_size() == "1023.0 B"
+        assert Node(handle='a', name='a', size=1536)._format_size() == "1.5 KB"
+        assert Node(handle='a', name='a', size=3 << 50)._format_size() == "3.0 PB"
+        assert Node(handle='a', name='a', size=1 << 60)._format_size() == "1024.0 PB"
+
+
+class _FakeContent:
+    """Minimal stand-in for aiohttp's StreamReader."""
+
+    def __init__(self, data, read_size=None):
+        self._data = data
+        self._read_size = read_size
+
+    async def iter_chunked(self, size):
+        # Like a real socket, a read may return fewer bytes than asked for
+        size = min(size, self._read_size or size)
+        for i in range(0, len(self._data), size):
+            yield self._data[i:i + size]
+
+
+def _fake_session(data, read_size=None):
+    """Build a ClientSession mock that serves `data` for any GET."""
+    response = MagicMock()
+    response.content = _FakeContent(data, read_size)
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.closed = False
+    session.get = MagicMock(return_value=response)
+    return session
+
+
+def _range_session(data):
+    """Build a ClientSession mock that serves the requested Range of `data`."""
+    def get(url, headers):
+        first, last = map(int, headers['Range'][len('bytes='):].split('-'))
+        response = MagicMock()
+        response.content = _FakeContent(data[first:last + 1])
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=False)
+        return response
+
+    session = MagicMock()
+    session.closed = False
+    session.get = MagicMock(side_effect=get)
+    return session
+
+
+class TestNodeLoading:
+    """Test suite for lazy node tree loading."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        """Test concurrent lookups on a cold client fetch the tree once."""
+        client = MegaClient()
+        client._master_key = b'\x00' * 16
+        client._api = MagicMock()
+
+        async def get_files():
+            await asyncio.sleep(0.01)
+            return {'f': []}
+
+        client._api.get_files = AsyncMock(side_effect=get_files)
+
+        await asyncio.gather(client.load(), client.find('x'), client.get('/x'), client.list_files())
+
+        assert client._api.get_files.await_count == 1
+
+        await client.load(refresh=True)
+        assert client._api.get_files.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_tree_is_built_off_the_event_loop(self):
+        """Test node decryption runs in a worker thread."""
+        client = MegaClient()
+        client._master_key = b'\x00' * 16
+        client._api = MagicMock()
+        client._api.get_files = AsyncMock(return_value={'f': []})
+        threads = []
+
+        with patch.object(NodeService, 'load', lambda self, response: threads.append(threading.get_ident())):
+            await client.load()
+
+        assert threads and threads[0] != threading.get_ident()
+
+
+class TestDownload:
+    """Test suite for download()."""
+
+    @pytest.mark.asyncio
+    async def test_download_decrypts_to_file(self, loaded_client, tmp_path):
+        """Test multi-chunk download is decrypted and written in order."""
+        data = get_random_bytes(MegaClient.DOWNLOAD_CHUNK_SIZE * 2 + 1234)
+        encryptor = MegaEncrypt(get_random_bytes(24))
+        encrypted = encryptor.encrypt(data)
+        _, full_key = encryptor.finalize()
+
+        node = Node(handle='f', name='data.bin', size=len(data), key=full_key)
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value={'g': 'http://dl', 's': len(data)})
+        progress = []
+
+        loaded_client._http_session = _fake_session(encrypted)
+        with patch('megapy.client.time.monotonic', return_value=0.0):
+            dest = await loaded_client.download(node, tmp_path, lambda d, t: progress.append(d))
+
+        assert dest == tmp_path / 'data.bin'
+        assert dest.read_bytes() == data
+        assert progress[-1] == len(data)
+
+    @pytest.mark.asyncio
+    async def test_download_coalesces_short_reads(self, loaded_client, tmp_path):
+        """Test short network reads are decrypted into full-chunk writes."""
+        data = get_random_bytes(MegaClient.DOWNLOAD_CHUNK_SIZE * 2 + 1234)
+        encryptor = MegaEncrypt(get_random_bytes(24))
+        encrypted = encryptor.encrypt(data)
+        _, full_key = encryptor.finalize()
+
+        node = Node(handle='f', name='data.bin', size=len(data), key=full_key)
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value={'g': 'http://dl', 's': len(data)})
+
+        loaded_client._http_session = _fake_session(encrypted, read_size=100000)
+        with patch('megapy.client.AsyncFileWriter.write', autospec=True,
+                   side_effect=AsyncFileWriter.write) as write:
+            dest = await loaded_client.download(node, tmp_path)
+
+        assert dest.read_bytes() == data
+        assert [len(call.args[1]) for call in write.call_args_list] == [
+            MegaClient.DOWNLOAD_CHUNK_SIZE, MegaClient.DOWNLOAD_CHUNK_SIZE, 1234
+        ]
+
+    @pytest.mark.asyncio
+    async def test_read_file_range_decrypts_unaligned_range(self, loaded_client):
+        """Test a byte range is decrypted with the counter at its offset."""
+        data = get_random_bytes(MegaClient.DOWNLOAD_CHUNK_SIZE + 5000)
+        key = get_random_bytes(24)
+        encryptor = MegaEncrypt(key)
+        encrypted = encryptor.encrypt(data)
+        mac, _ = encryptor.finalize()
+        # Node keys are stored in MEGA's merged form: key[:16] ^ key[16:32]
+        tail = key[16:] + mac
+        merged = bytes(a ^ b for a, b in zip(key[:16], tail)) + tail
+
+        node = Node(handle='f', name='data.bin', size=len(data), key=merged)
+        loaded_client.get_download_url = AsyncMock(return_value=('http://dl', len(data)))
+        offset, size = 1001, MegaClient.DOWNLOAD_CHUNK_SIZE + 7
+
+        loaded_client._http_session = _fake_session(encrypted[offset:offset + size])
+        result = await loaded_client.read_file_range(node, offset, size)
+
+        assert result == data[offset:offset + size]
+
+    @pytest.mark.asyncio
+    async def test_read_file_range_splits_large_ranges(self, loaded_client):
+        """Test large ranges are fetched as parallel parts and reassembled."""
+        data = get_random_bytes(100_000)
+        key = get_random_bytes(24)
+        encryptor = MegaEncrypt(key)
+        encrypted = encryptor.encrypt(data)
+        mac, _ = encryptor.finalize()
+        tail = key[16:] + mac
+        merged = bytes(a ^ b for a, b in zip(key[:16], tail)) + tail
+
+        node = Node(handle='f', name='data.bin', size=len(data), key=merged)
+        loaded_client.get_download_url = AsyncMock(return_value=('http://dl', len(data)))
+        loaded_client._http_session = _range_session(encrypted)
+        offset, size = 333, 70_001
+
+        with patch.object(MegaClient, 'RANGE_PART_SIZE', 16_384):
+            result = await loaded_client.read_file_range(node, offset, size)
+
+        assert result == data[offset:offset + size]
+        assert loaded_client._http_session.get.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_read_file_range_failed_part_cancels_the_rest(self, loaded_client):
+        """Test one failing part raises and stops the parts still downloading."""
+        node = Node(handle='f', name='data.bin', size=100_000, key=get_random_bytes(32))
+        loaded_client.get_download_url = AsyncMock(return_value=('http://dl', 100_000))
+        cancelled = []
+
+        class SlowContent:
+            async def iter_chunked(self, size):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                yield b''
+
+        class FailingContent:
+            async def iter_chunked(self, size):
+                await asyncio.sleep(0)  # Let the other parts start
+                raise RuntimeError("connection reset")
+                yield b''
+
+        def get(url, headers):
+            response = MagicMock()
+            response.__aenter__ = AsyncMock(return_value=response)
+            response.__aexit__ = AsyncMock(return_value=False)
+            failing = headers['Range'].startswith('bytes=0-')
+            response.content = FailingContent() if failing else SlowContent()
+            return response
+
+        loaded_client._http_session = MagicMock(closed=False, get=MagicMock(side_effect=get))
+
+        with patch.object(MegaClient, 'RANGE_PART_SIZE', 16_384), pytest.raises(RuntimeError):
+            await loaded_client.read_file_range(node, 0, 50_000)
+
+        assert len(cancelled) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('served', [995, 1005])
+    async def test_read_file_range_rejects_wrong_part_length(self, loaded_client, served):
+        """Test a response shorter or longer than the requested range is an error."""
+        node = Node(handle='f', name='data.bin', size=100_000, key=get_random_bytes(32))
+        loaded_client.get_download_url = AsyncMock(return_value=('http://dl', 100_000))
+        loaded_client._http_session = _fake_session(get_random_bytes(served))
+
+        with pytest.raises(ValueError):
+            await loaded_client.read_file_range(node, 10, 1000)
+
+
+class TestHttpSession:
+    """Test suite for the shared transfer session."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused_and_closed(self):
+        """Test one session serves all transfers until close()."""
+        client = MegaClient()
+
+        session = await client._ensure_http_session()
+        assert await client._ensure_http_session() is session
+
+        await client.close()
+        assert session.closed
+        assert client._http_session is None
+
+    @pytest.mark.asyncio
+    async def test_session_requests_identity_encoding(self):
+        """Test transfers ask the server not to compress encrypted data."""
+        client = MegaClient()
+
+        session = await client._ensure_http_session()
+        try:
+            assert session.headers['Accept-Encoding'] == 'identity'
+        finally:
+            await client.close()
+
+
+class TestDownloadFileAttribute:
+    """Test suite for _download_file_attribute()."""
+
+    def _serve(self, client, payload, handle):
+        """Serve an attribute response for `handle` from the shared session."""
+        resp = MagicMock()
+        resp.status = 200
+        resp.read = AsyncMock(return_value=handle + len(payload).to_bytes(4, 'little') + payload)
+        resp.__aenter__ = AsyncMock(return_value=resp)
+        resp.__aexit__ = AsyncMock(return_value=False)
+        client._http_session = MagicMock()
+        client._http_session.closed = False
+        client._http_session.post = MagicMock(return_value=resp)
+        client._api = MagicMock()
+        client._api.request = AsyncMock(return_value={'p': 'http://fa'})
+
+    @pytest.mark.asyncio
+    async def test_decrypts_jpeg_and_trims_padding(self, loaded_client):
+        """Test JPEG attributes are cut at the end marker."""
+        from megapy.core.crypto import aes_cbc_encrypt, Base64Encoder
+
+        key = get_random_bytes(32)
+        k = bytes(a ^ b for a, b in zip(key[:16], key[16:32]))
+        jpeg = b'\xff\xd8' + get_random_bytes(20).replace(b'\xff', b'\x00') + b'\xff\xd9'
+        padded = jpeg + bytes(-len(jpeg) % 16)
+        handle = get_random_bytes(8)
+        self._serve(loaded_client, aes_cbc_encrypt(k, padded), handle)
+        node = Node(handle='f', name='a.jpg', key=key)
+
+        result = await loaded_client._download_file_attribute(node, Base64Encoder.encode(handle), 0)
+
+        assert result == jpeg
+
+    @pytest.mark.asyncio
+    async def test_strips_null_padding(self, loaded_client):
+        """Test non-JPEG attributes lose trailing null padding."""
+        from megapy.core.crypto import aes_cbc_encrypt, Base64Encoder
+
+        key = get_random_bytes(16)
+        data = b'not a jpeg'
+        handle = get_random_bytes(8)
+        self._serve(loaded_client, aes_cbc_encrypt(key, data + bytes(6)), handle)
+        node = Node(handle='f', name='a.bin', key=key)
+
+        result = await loaded_client._download_file_attribute(node, Base64Encoder.encode(handle), 0)
+
+        assert result == data
+
+
+class TestBulkFileAttributes:
+    """Test suite for concurrent thumbnail/preview downloads."""
+
+    @pytest.mark.asyncio
+    async def test_get_thumbnails_maps_handles(self, loaded_client):
+        """Test results are keyed by node handle; nodes without one get None."""
+        with_thumb = Node(handle='a', name='a.jpg', fa='123:0*AAAAAAAAAAA')
+        without_thumb = Node(handle='b', name='b.txt')
+        loaded_client._download_file_attribute = AsyncMock(return_value=b'jpeg')
+
+        result = await loaded_client.get_thumbnails([with_thumb, without_thumb])
+
+        assert result == {'a': b'jpeg', 'b': None}
+        loaded_client._download_file_attribute.assert_awaited_once_with(with_thumb, 'AAAAAAAAAAA', 0)
+
+    @pytest.mark.asyncio
+    async def test_bulk_download_is_bounded(self, loaded_client):
+        """Test no more than ATTRIBUTE_DOWNLOAD_CONCURRENCY fetches run at once."""
+        running = 0
+        peak = 0
+
+        async def fake_download(node, handle, attr_type):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return b'x'
+
+        loaded_client._download_file_attribute = fake_download
+        nodes = [Node(handle=str(i), name=f'{i}.jpg', fa='1:1*AAAAAAAAAAA') for i in range(40)]
+
+        result = await loaded_client.get_previews(nodes)
+
+        assert len(result) == 40
+        assert 1 < peak <= MegaClient.ATTRIBUTE_DOWNLOAD_CONCURRENCY
+
+
+def _fake_coordinator(result):
+    """Build an UploadCoordinator mock that resolves pending_media like the real one."""
+    async def upload(config):
+        thumbnail, preview, media_info = await config.pending_media
+        config.thumbnail = config.thumbnail or thumbnail
+        config.preview = config.preview or preview
+        config.media_info = config.media_info or media_info
+        return result
+
+    coordinator = MagicMock()
+    coordinator.upload = AsyncMock(side_effect=upload)
+    return coordinator
+
+
+class TestUpdate:
+    """Test suite for update() media handling."""
+
+    @pytest.mark.asyncio
+    async def test_media_work_runs_off_loop_and_feeds_upload(self, loaded_client, tmp_path):
+        """Test thumbnail/preview/metadata are generated in worker threads."""
+        import threading
+        from megapy.core.attributes import MediaResult
+        from megapy.core.upload import UploadResult
+        from megapy.core.upload.models import FileAttributes
+
+        new_content = tmp_path / "clip.mp4"
+        new_content.write_bytes(b"video")
+        loop_thread = threading.get_ident()
+        threads = []
+
+        class FakeProcessor:
+            def is_media(self, path):
+                return True
+
+            def inspect(self, path, generate_images=True):
+                threads.append(threading.get_ident())
+                return MediaResult(
+                    thumbnail=b'thumb', preview=b'preview', is_media=True,
+                    media_type='video', metadata='media-info'
+                )
+
+        loaded_client._get_media_processor = lambda: FakeProcessor()
+        coordinator = _fake_coordinator(UploadResult(
+            node_handle='new', file_key=b'k' * 32, file_size=5,
+            attributes=FileAttributes(name='report.pdf')
+        ))
+
+        with patch('megapy.client.UploadCoordinator', return_value=coordinator):
+            node = await loaded_client.update('rep', new_content)
+
+        config = coordinator.upload.await_args.args[0]
+        assert node.handle == 'new'
+        assert config.replace_handle == 'rep'
+        assert (config.thumbnail, config.preview, config.media_info) == (b'thumb', b'preview', 'media-info')
+        assert config.file_size == 5
+        assert config.attributes.mtime == int(new_content.stat().st_mtime)
+        assert threads and loop_thread not in threads
+
+
+class TestBuildEncryptedAttrs:
+    """Test suite for node attribute encryption used by rename()/create_folder()."""
+
+    def test_file_key_is_unmerged(self):
+        """Test 32-byte file keys encrypt with key[:16] ^ key[16:32]."""
+        from megapy.core.attributes.packer import AttributesPacker
+        from megapy.core.crypto import Base64Encoder
+
+        key = get_random_bytes(32)
+        attr_key = bytes(a ^ b for a, b in zip(key[:16], key[16:32]))
+
+        encrypted = Base64Encoder.decode(MegaClient._build_encrypted_attrs(key, {'n': 'año.txt'}))
+
+        assert AttributesPacker.unpack(encrypted, attr_key).name == 'año.txt'
+
+    def test_padding_always_present(self):
+        """Test a block-aligned payload still gets a null padding block."""
+        from megapy.core.attributes.packer import AttributesPacker
+
+        # b'MEGA{"n":""}' is 12 bytes, so a 20-character name fills two blocks
+        packed = AttributesPacker.pack_raw({'n': 'abcdefghijklmnopqrst'})
+
+        assert len(packed) == 48
+        assert packed.endswith(bytes(16))
+
+    @pytest.mark.asyncio
+    async def test_rename_sends_encrypted_name(self, loaded_client):
+        """Test rename() sends attributes readable with the node's attribute key."""
+        from megapy.core.attributes.packer import AttributesPacker
+        from megapy.core.crypto import Base64Encoder
+
+        key = get_random_bytes(32)
+        node = loaded_client._node_service.get('rep')
+        node.key = key
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value=0)
+
+        await loaded_client.rename(node, 'renamed.pdf')
+
+        sent = loaded_client._api.request.await_args.args[0]
+        attr_key = bytes(a ^ b for a, b in zip(key[:16], key[16:32]))
+        assert sent['n'] == 'rep'
+        assert AttributesPacker.unpack(Base64Encoder.decode(sent['attr']), attr_key).name == 'renamed.pdf'
+        assert node.name == 'renamed.pdf'
+
+
+class TestCreateFolders:
+    """Test suite for create_folder()/create_folders()."""
+
+    @pytest.mark.asyncio
+    async def test_new_folders_share_one_request(self, loaded_client):
+        """Test missing folders are created in one 'p' call, existing ones reused."""
+        from Crypto.Cipher import AES
+        from megapy.core.attributes.packer import AttributesPacker
+        from megapy.core.crypto import Base64Encoder
+
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value={'f': [{'h': 'new1'}, {'h': 'new2'}]})
+
+        nodes = await loaded_client.create_folders(['Documents', 'Music', 'Photos', 'Music'])
+
+        loaded_client._api.request.assert_awaited_once()
+        sent = loaded_client._api.request.await_args.args[0]
+        assert (sent['a'], sent['t']) == ('p', 'root')
+        master = AES.new(loaded_client._master_key, AES.MODE_ECB)
+        names = [
+            AttributesPacker.unpack(
+                Base64Encoder.decode(entry['a']),
+                master.decrypt(Base64Encoder.decode(entry['k']))
+            ).name
+            for entry in sent['n']
+        ]
+        assert names == ['Music', 'Photos']
+        assert [node.handle for node in nodes] == ['docs', 'new1', 'new2', 'new1']
+        assert loaded_client._node_service.root.get('Photos').handle == 'new2'
+
+    @pytest.mark.asyncio
+    async def test_existing_folder_skips_request(self, loaded_client):
+        """Test create_folder() returns an existing folder without an API call."""
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock()
+
+        node = await loaded_client.create_folder('Documents')
+
+        assert node.handle == 'docs'
+        loaded_client._api.request.assert_not_awaited()
+
+
+class TestMasterCipher:
+    """Test suite for the cached master key cipher."""
+
+    def test_cipher_is_cached_per_master_key(self, loaded_client):
+        """Test the cipher is reused and rebuilt when the master key changes."""
+        from Crypto.Cipher import AES
+
+        cipher = loaded_client._get_master_cipher()
+        assert loaded_client._get_master_cipher() is cipher
+
+        loaded_client._master_key = get_random_bytes(16)
+        block = get_random_bytes(16)
+        expected = AES.new(loaded_client._master_key, AES.MODE_ECB).encrypt(block)
+
+        assert loaded_client._get_master_cipher() is not cipher
+        assert loaded_client._get_master_cipher().encrypt(block) == expected
+
+
+class TestPromptCredentials:
+    """Test suite for interactive credential prompts."""
+
+    @pytest.mark.asyncio
+    async def test_prompts_only_for_missing_values(self):
+        """Test configured credentials skip their prompt."""
+        client = MegaClient()
+        client._email = 'user@example.com'
+
+        with patch('builtins.input') as fake_input, \
+                patch('getpass.getpass', return_value='secret') as fake_getpass:
+            result = await client._prompt_credentials()
+
+        assert result == ('user@example.com', 'secret')
+        fake_input.assert_not_called()
+        fake_getpass.assert_called_once()
+
+
+class TestAccountInfo:
+    """Test suite for AccountInfo derived values."""
+
+    def test_derived_values(self):
+        """Test derived values are available as plain attributes."""
+        info = AccountInfo(account_type=1, space_used=1024 ** 3, space_total=4 * 1024 ** 3)
+
+        assert info.space_free == 3 * 1024 ** 3
+        assert info.space_free_gb == 3.0
+        assert info.space_total_gb == 4.0
+        assert info.is_pro_account and not info.is_free_account
+        assert info.has_space_for(1024)
+
+    def test_immutable(self):
+        """Test instances can't be modified (derived values can't go stale)."""
+        import dataclasses
+
+        info = AccountInfo(account_type=0, space_used=1, space_total=2)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.space_used = 2
+
+
+class TestStartupPrefetch:
+    """Test suite for post-login prefetching and account info caching."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_runs_concurrently_and_tolerates_failures(self, loaded_client):
+        """Test one failing request doesn't stop the others."""
+        started = []
+
+        async def track(name, fail=False):
+            started.append(name)
+            await asyncio.sleep(0)
+            if fail:
+                raise RuntimeError(name)
+            return name
+
+        loaded_client.load_codecs = lambda: track('codecs')
+        loaded_client._ensure_nodes = lambda: track('nodes', fail=True)
+        loaded_client.get_account_info = lambda: track('account')
+
+        await loaded_client._prefetch()
+
+        assert sorted(started) == ['account', 'codecs', 'nodes']
+
+    @pytest.mark.asyncio
+    async def test_account_info_is_cached(self, loaded_client):
+        """Test get_account_info() reuses a recent result unless refreshed."""
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value={'utype': 0, 'cstrg': 1, 'mstrg': 2})
+
+        first = await loaded_client.get_account_info()
+        assert await loaded_client.get_account_info() is first
+        assert loaded_client._api.request.await_count == 1
+
+        await loaded_client.get_account_info(refresh=True)
+        assert loaded_client._api.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_invalidates_account_info(self, loaded_client, tmp_path):
+        """Test an upload makes the next get_account_info() fetch again."""
+        from megapy.core.upload import UploadResult
+        from megapy.core.upload.models import FileAttributes
+
+        source = tmp_path / "notes.txt"
+        source.write_bytes(b"notes")
+        loaded_client._api = MagicMock()
+        loaded_client._api.request = AsyncMock(return_value={'utype': 0, 'cstrg': 1, 'mstrg': 2})
+        coordinator = _fake_coordinator(UploadResult(
+            node_handle='new', file_key=b'k' * 32, file_size=5,
+            attributes=FileAttributes(name='notes.txt')
+        ))
+
+        await loaded_client.get_account_info()
+        with patch('megapy.client.UploadCoordinator', return_value=coordinator):
+            await loaded_client.upload(source, auto_thumb=False)
+        await loaded_client.get_account_info()
+
+        assert loaded_client._api.request.await_count == 2
+
+
+class TestCodecs:
+    """Test suite for applying the codec list to the media maps."""
+
+    def test_same_codec_list_is_applied_once(self, monkeypatch):
+        """Test re-applying an already merged codec list is skipped."""
+        from megapy.core.attributes import media
+
+        container = {}
+        monkeypatch.setattr(media, 'CONTAINER_MAP', container)
+        monkeypatch.setattr(MegaClient, '_codecs_applied', None)
+        codecs = {'container': {999: 'test'}}
+
+        MegaClient()._apply_codecs(codecs)
+        container.clear()
+        MegaClient()._apply_codecs(codecs)
+
+        assert container == {}
+        MegaClient()._apply_codecs({'container': {999: 'test'}})
+        assert container == {999: 'test'}
+
+
+class TestUploadMedia:
+    """Test suite for upload() media handling."""
+
+    @pytest.mark.asyncio
+    async def test_custom_thumbnail_wins_over_generated(self, loaded_client, tmp_path):
+        """Test a custom thumbnail is kept and the processor fills the preview."""
+        from megapy.core.attributes import MediaResult
+        from megapy.core.upload import UploadResult
+        from megapy.core.upload.models import FileAttributes
+
+        photo = tmp_path / "photo.jpg"
+        photo.write_bytes(b"jpeg")
+        calls = []
+
+        class FakeProcessor:
+            def is_media(self, path):
+                return True
+
+            def inspect(self, path, generate_images=True):
+                calls.append(generate_images)
+                return MediaResult(thumbnail=b'auto-thumb', preview=b'auto-preview',
+                                   is_media=True, media_type='image')
+
+        loaded_client._get_media_processor = lambda: FakeProcessor()
+        loaded_client._get_thumbnail_service = lambda: MagicMock(generate=lambda src: b'custom')
+        coordinator = _fake_coordinator(UploadResult(
+            node_handle='new', file_key=b'k' * 32, file_size=4,
+            attributes=FileAttributes(name='photo.jpg')
+        ))
+
+        with patch('megapy.client.UploadCoordinator', return_value=coordinator):
+            await loaded_client.upload(photo, thumbnail=b'raw')
+
+        config = coordinator.upload.await_args.args[0]
+        assert calls == [True]
+        assert (config.thumbnail, config.preview) == (b'custom', b'auto-preview')
+        assert config.file_size == 4
+        assert config.attributes.mtime == int(photo.stat().st_mtime)
+
+    @pytest.mark.asyncio
+    async def test_media_work_is_cancelled_when_upload_fails(self, loaded_client, tmp_path):
+        """Test pending media work doesn't outlive a failed transfer."""
+        photo = tmp_path / "photo.jpg"
+        photo.write_bytes(b"jpeg")
+        started = asyncio.Event()
+        pending = []
+
+        async def slow_prepare(*args):
+            started.set()
+            await asyncio.sleep(10)
+
+        async def failing_upload(config):
+            pending.append(config.pending_media)
+            await started.wait()
+            raise ValueError("upload failed")
+
+        loaded_client._prepare_media = slow_prepare
+        coordinator = MagicMock()
+        coordinator.upload = AsyncMock(side_effect=failing_upload)
+
+        with patch('megapy.client.UploadCoordinator', return_value=coordinator):
+            with pytest.raises(ValueError):
+                await loaded_client.upload(photo)
+
+        await asyncio.sleep(0)
+        assert pending[0].cancelled()
+
+
+class TestTransferMany:
+    """Test suite for download_many()/upload_many()."""
+
+    @pytest.mark.asyncio
+    async def test_download_many_bounds_concurrency_and_keeps_order(self, loaded_client, tmp_path):
+        """Test no more than `concurrency` downloads run at once and results keep input order."""
+        running = 0
+        peak = 0
+
+        async def download(file, dest):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 if file == 'a' else 0)
+            running -= 1
+            return tmp_path / file
+
+        loaded_client.download = download
+        progress = []
+
+        paths = await loaded_client.download_many(
+            ['a', 'b', 'c', 'd'], tmp_path, concurrency=2,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        assert paths == [tmp_path / name for name in 'abcd']
+        assert peak == 2
+        assert progress[-1] == (4, 4)
+
+    @pytest.mark.asyncio
+    async def test_upload_many_cancels_the_rest_on_failure(self, loaded_client):
+        """Test the first failed upload is raised and pending uploads are cancelled."""
+        started = []
+
+        async def upload(path, dest_folder):
+            started.append(path)
+            if path == 'bad':
+                raise ValueError("upload failed")
+            await asyncio.sleep(10)
+
+        loaded_client.upload = upload
+
+        with pytest.raises(ValueError):
+            await loaded_client.upload_many(['bad', 'slow', 'never'], concurrency=2)
+        await asyncio.sleep(0)
+
+        assert 'never' not in started
+
+
+class TestRegistration:
+    """Test suite for the registration flow."""
+
+    @pytest.mark.asyncio
+    async def test_rsa_key_is_taken_during_init_register(self):
+        """Test finalize_registration reuses the key taken by init_register."""
+        client = MegaClient()
+        client._api = MagicMock()
+        rsa_key = object()
+
+        async def init_register(data):
+            data.master_key = b'\x01' * 16
+            data.client_random_value = b'\x02' * 16
+            return MagicMock(success=True)
+
+        registration = MagicMock()
+        registration.init_register = AsyncMock(side_effect=init_register)
+        registration.finalize_registration = AsyncMock(return_value=MagicMock(success=True))
+
+        with patch('megapy.client.StandardAccountRegistration', return_value=registration), \
+                patch('megapy.client.rsa_pool.get_key', AsyncMock(return_value=rsa_key)) as get_key:
+            await client.init_register("user@example.com", "secret", "John", "Doe")
+            await client.finalize_registration("code")
+
+        get_key.assert_awaited_once()
+        assert registration.finalize_registration.call_args.kwargs['rsa_key'] is rsa_key
+        assert client._registration_rsa_future is None
+
+    @pytest.mark.asyncio
+    async def test_abandoned_registration_cancels_rsa_key(self):
+        """Test a repeated init_register() or close() cancels the pending key."""
+        client = MegaClient()
+        client._api = MagicMock()
+        client._api.close = AsyncMock()
+        never_ready = asyncio.Event()
+
+        async def init_register(data):
+            data.master_key = b'\x01' * 16
+            data.client_random_value = b'\x02' * 16
+            return MagicMock(success=True)
+
+        async def get_key():
+            await never_ready.wait()
+
+        registration = MagicMock()
+        registration.init_register = AsyncMock(side_effect=init_register)
+
+        with patch('megapy.client.StandardAccountRegistration', return_value=registration), \
+                patch('megapy.client.rsa_pool.get_key', get_key):
+            await client.init_register("user@example.com", "secret", "John", "Doe")
+            first = client._registration_rsa_future
+            await client.init_register("user@example.com", "secret", "John", "Doe")
+            second = client._registration_rsa_future
+            await client.close()
+        await asyncio.sleep(0)
+
+        assert first.cancelled() and second.cancelled()
+        assert client._registration_rsa_future is None
+
+
+class TestPublicFolderChildren:
+    """Test suite for _load_children_from_api_result()."""
+
+    @pytest.mark.asyncio
+    async def test_builds_nested_tree(self):
+        """Test nodes are attached under their parents at every depth."""
+        client = MegaClient()
+        all_nodes = [
+            {'h': 'root', 't': 1, 'k': 'root:k', 'a': 'AAAA'},
+            {'h': 'sub', 'p': 'root', 't': 1, 'k': 'sub:k', 'a': 'AAAA'},
+            {'h': 'a', 'p': 'sub', 't': 0, 's': 5, 'k': 'a:k', 'a': 'AAAA'},
+            {'h': 'b', 'p': 'root', 't': 0, 's': 7, 'k': 'b:k', 'a': 'AAAA'},
+        ]
+
+        def parse_key(key, parent_key):
+            handle = key.split(':')[0]
+            manager = MagicMock(full_key=b'\x00' * 16)
+            manager.decrypt_attributes.return_value = SimpleNamespace(name=f"name-{handle}")
+            return manager
+
+        folder = Node(handle='root', name='root', is_folder=True)
+        with patch('megapy.client.KeyFileManager.parse_key', side_effect=parse_key):
+            await client._load_children_from_api_result(folder, all_nodes, b'\x00' * 16)
+
+        assert [child.handle for child in folder.children] == ['sub', 'b']
+        sub = folder.children[0]
+        assert [child.name for child in sub.children] == ['name-a']
+        assert sub.children[0].parent is sub
+
+    @pytest.mark.asyncio
+    async def test_node_without_attributes_is_named_by_handle(self):
+        """Test a node with no attribute blob skips decryption and keeps its handle as name."""
+        client = MegaClient()
+        all_nodes = [{'h': 'bare', 'p': 'root', 't': 0, 'k': 'bare:k'}]
+        manager = MagicMock(full_key=b'\x00' * 16)
+
+        folder = Node(handle='root', name='root', is_folder=True)
+        with patch('megapy.client.KeyFileManager.parse_key', return_value=manager):
+            await client._load_children_from_api_result(folder, all_nodes, b'\x00' * 16)
+
+        manager.decrypt_attributes.assert_not_called()
+        assert folder.children[0].name == 'bare'
+        assert folder.children[0].attributes is None
+
+
+class TestResolveUrl:
+    """Test suite for _resolve_url()."""
+
+    @pytest.mark.asyncio
+    async def test_file_link_requests_file_info(self):
+        """Test a /file/ link is resolved through a 'g' request for its handle."""
+        client = MegaClient()
+        client._api = MagicMock()
+        client._api.request = AsyncMock(return_value={'s': 42})
+
+        node = await client._resolve_url("https://mega.nz/file/AbCd1234#" + "A" * 43)
+
+        client._api.request.assert_awaited_once_with({'a': 'g', 'p': 'AbCd1234'})
+        assert node.handle == 'AbCd1234'
+        assert not node.is_folder
+        assert node.size == 42
+
+    @pytest.mark.asyncio
+    async def test_unknown_link_kind_raises(self):
+        """Test a link that is neither /folder/ nor /file/ is rejected."""
+        with pytest.raises(ValueError):
+            await MegaClient()._resolve_url("https://mega.nz/chat/AbCd1234#key")
+
+    @pytest.mark.asyncio
+    async def test_resolve_urls_keeps_order(self):
+        """Test several links resolve together and come back in order."""
+        client = MegaClient()
+        client._api = MagicMock()
+        client._api.request = AsyncMock(side_effect=lambda data: {'s': len(data['p'])})
+
+        nodes = await client.resolve_urls([
+            "https://mega.nz/file/AbCd1234#" + "A" * 43,
+            "https://mega.nz/file/Xy#" + "A" * 43,
+        ])
+
+        assert [node.handle for node in nodes] == ['AbCd1234', 'Xy']
+        assert [node.size for node in nodes] == [8, 2]
+
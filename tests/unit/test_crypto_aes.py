@@ -5,6 +5,7 @@ from Crypto.Random import get_random_bytes
 from megapy.core.crypto.aes.strategies import AESCBCStrategy, AESECBStrategy
 from megapy.core.crypto.aes.aes_crypto import AESCrypto
 from megapy.core.crypto.aes.encryption_service import EncryptionService, DecryptionService
+from megapy.core.crypto import aes_cbc_encrypt, aes_cbc_decrypt, aes_cbc_decrypt_into
 
 
 class TestAESCBCStrategy:
@@ -373,3 +374,37 @@ class TestDecryptionServiceDecryptData:
         # Decrypt full data
         decrypted_full = service.decrypt_data(encrypted, merged_key, 0)
         assert decrypted_full == data
+
+
+class TestCBCHelpers:
+    """Test suite for aes_cbc_encrypt/aes_cbc_decrypt helpers."""
+    
+    def test_matches_cbc_strategy(self):
+        """Test helpers match the zero-IV CBC strategy."""
+        key = get_random_bytes(16)
+        data = get_random_bytes(64)
+        
+        assert aes_cbc_encrypt(key, data) == AESCBCStrategy().encrypt(data, key)
+        assert aes_cbc_decrypt(data, key) == AESCBCStrategy().decrypt(data, key)
+    
+    def test_roundtrip(self):
+        """Test encrypt/decrypt roundtrip."""
+        key = get_random_bytes(16)
+        data = b"MEGA{\"n\":\"x\"}" + b"\x00" * 3
+        
+        assert aes_cbc_decrypt(aes_cbc_encrypt(key, data), key) == data
+    
+    def test_unaligned_data_raises(self):
+        """Test data not aligned to the block size is rejected."""
+        with pytest.raises(ValueError):
+            aes_cbc_encrypt(get_random_bytes(16), b"short")
+    
+    def test_decrypt_into_in_place(self):
+        """Test in-place decrypt matches aes_cbc_decrypt."""
+        key = get_random_bytes(16)
+        data = get_random_bytes(48)
+        buffer = bytearray(data) + bytearray(15)
+        
+        aes_cbc_decrypt_into(buffer, 48, key)
+        
+        assert bytes(buffer[:48]) == aes_cbc_decrypt(data, key)
@@ -136,3 +136,11 @@ class TestBase64EncoderEdgeCases:
         # Single character is invalid base64 (not multiple of 4 after padding calc)
         with pytest.raises(binascii.Error):
             encoder.decode("A")
+    
+    def test_module_helpers_match_encoder(self):
+        """Test megapy.core.utils helpers use the same codec."""
+        from megapy.core.utils import b64encode, b64decode
+        data = bytes(range(256))
+        
+        assert b64encode(data) == Base64Encoder.encode(data)
+        assert b64decode(b64encode(data)) == data
@@ -2,7 +2,7 @@
 import pytest
 from Crypto.Random import get_random_bytes
 
-from megapy.core.crypto.file import MegaEncrypt, MegaDecrypt, merge_key_mac
+from megapy.core.crypto.file import MegaEncrypt, MegaDecrypt, merge_key_mac, create_ctr_decryptor
 
 
 class TestMegaEncrypt:
@@ -221,3 +221,42 @@ class TestMergeKeyMac:
         result = merge_key_mac(b"", b"")
         
         assert result == b""
+
+
+class TestCreateCtrDecryptor:
+    """Test suite for create_ctr_decryptor."""
+    
+    def test_matches_mega_decrypt(self):
+        """Test output matches MegaDecrypt from the start of the file."""
+        encryptor = MegaEncrypt(get_random_bytes(24))
+        encrypted = encryptor.encrypt(get_random_bytes(4096))
+        _, full_key = encryptor.finalize()
+        
+        expected = MegaDecrypt(full_key).decrypt(encrypted)
+        
+        assert create_ctr_decryptor(full_key).update(encrypted) == expected
+    
+    @pytest.mark.parametrize("position", [16, 17, 1000, 131073])
+    def test_matches_mega_decrypt_at_position(self, position):
+        """Test aligned and unaligned start positions."""
+        key = get_random_bytes(32)
+        data = get_random_bytes(1000)
+        
+        expected = MegaDecrypt(key, options={'position': position}).decrypt(data, position=position)
+        
+        assert create_ctr_decryptor(key, position).update(data) == expected
+    
+    def test_streaming_keeps_counter(self):
+        """Test sequential update() calls continue the keystream."""
+        key = get_random_bytes(24)
+        data = get_random_bytes(1000)
+        decryptor = create_ctr_decryptor(key)
+        
+        streamed = decryptor.update(data[:333]) + decryptor.update(data[333:])
+        
+        assert streamed == create_ctr_decryptor(key).update(data)
+    
+    def test_short_key_raises(self):
+        """Test key shorter than 24 bytes raises."""
+        with pytest.raises(ValueError, match="Key too short"):
+            create_ctr_decryptor(get_random_bytes(16))
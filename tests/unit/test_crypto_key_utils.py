@@ -77,6 +77,14 @@ class TestKeyManager:
         
         # XOR of 0x00 and 0xFF should be 0xFF
         assert result[:16] == b"\xff" * 16
+    
+    def test_xor_matches_bytewise(self):
+        """Test xor() matches a byte-by-byte XOR, leading zeros included."""
+        a = bytes(range(16))
+        b = b"\x00" * 8 + bytes(range(100, 108))
+        
+        assert KeyManager.xor(a, b) == bytes(x ^ y for x, y in zip(a, b))
+        assert KeyManager.xor(a, a) == b"\x00" * 16
 
 
 class TestKeyManagerEdgeCases:
@@ -0,0 +1,79 @@
+"""Tests for download writer."""
+import pytest
+from unittest.mock import patch
+
+from megapy.core.download import AsyncFileWriter, BufferPool
+
+
+class TestAsyncFileWriter:
+    """Test suite for AsyncFileWriter."""
+    
+    @pytest.mark.asyncio
+    async def test_writes_chunks_in_order(self, tmp_path):
+        """Test all queued chunks end up in the file in order."""
+        dest = tmp_path / "out.bin"
+        chunks = [bytes([i]) * 1000 for i in range(20)]
+        
+        async with AsyncFileWriter(dest, max_pending=2) as writer:
+            for chunk in chunks:
+                await writer.write(chunk)
+        
+        assert dest.read_bytes() == b"".join(chunks)
+    
+    @pytest.mark.asyncio
+    async def test_empty_file(self, tmp_path):
+        """Test writer creates the file even with no data."""
+        dest = tmp_path / "empty.bin"
+        
+        async with AsyncFileWriter(dest):
+            pass
+        
+        assert dest.exists()
+        assert dest.read_bytes() == b""
+    
+    @pytest.mark.asyncio
+    async def test_write_error_is_raised(self, tmp_path):
+        """Test a failed disk write surfaces to the caller."""
+        dest = tmp_path / "fail.bin"
+        
+        with patch('aiofiles.threadpool.binary.AsyncBufferedIOBase.write', side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                async with AsyncFileWriter(dest, max_pending=1) as writer:
+                    for _ in range(5):
+                        await writer.write(b"data")
+    
+    @pytest.mark.asyncio
+    async def test_releases_pooled_buffers(self, tmp_path):
+        """Test pooled buffers are returned once written."""
+        dest = tmp_path / "pooled.bin"
+        pool = BufferPool(16, 2)
+        
+        async with AsyncFileWriter(dest, pool=pool) as writer:
+            for i in range(10):
+                buffer = await pool.acquire()
+                buffer[:4] = bytes([i]) * 4
+                await writer.write(memoryview(buffer)[:4], buffer)
+        
+        assert pool.available == 2
+        assert dest.read_bytes() == b"".join(bytes([i]) * 4 for i in range(10))
+
+
+class TestBufferPool:
+    """Test suite for BufferPool."""
+    
+    @pytest.mark.asyncio
+    async def test_acquire_and_release(self):
+        """Test buffers are reused rather than reallocated."""
+        pool = BufferPool(1024, 1)
+        
+        first = await pool.acquire()
+        assert len(first) == 1024
+        assert pool.available == 0
+        
+        pool.release(first)
+        assert await pool.acquire() is first
+    
+    def test_requires_buffers(self):
+        """Test empty pool is rejected."""
+        with pytest.raises(ValueError):
+            BufferPool(1024, 0)
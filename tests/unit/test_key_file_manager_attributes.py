@@ -244,3 +244,16 @@ class TestKeyFileManagerAttributes:
             # This is expected - decryption failed with wrong key
             assert True
 
+    
+    def test_parse_key_reuses_cipher_per_master_key(self, master_key, folder_key):
+        """Test node keys under one master key share one ECB cipher."""
+        from Crypto.Cipher import AES
+        from megapy.core.nodes.key import _ecb_cipher
+        from megapy.core.utils import b64encode
+        
+        encrypted = AES.new(master_key, AES.MODE_ECB).encrypt(folder_key)
+        key_str = f"owner:{b64encode(encrypted)}"
+        
+        assert KeyFileManager.parse_key(key_str, master_key).key == folder_key
+        assert KeyFileManager.parse_key(key_str, master_key).key == folder_key
+        assert _ecb_cipher(master_key) is _ecb_cipher(master_key)
@@ -144,6 +144,114 @@ class TestMediaProcessor:
         
         mock_gen.assert_not_called()
         assert result.preview is None
+    
+    # inspect tests
+    def test_inspect_non_media(self, processor):
+        """Test inspecting non-media file returns is_media=False."""
+        result = processor.inspect("document.txt")
+        
+        assert result.is_media is False
+        assert result.metadata is None
+    
+    def test_inspect_image_skips_metadata(self, processor, tmp_path):
+        """Test images get thumbnail/preview but no ffprobe call."""
+        from PIL import Image
+        photo = tmp_path / "photo.jpg"
+        Image.new('RGB', (64, 64)).save(photo)
+        
+        with patch.object(processor, 'generate_thumbnail', return_value=b'thumb'), \
+                patch.object(processor, 'generate_preview', return_value=b'preview'), \
+                patch.object(processor, 'extract_metadata') as mock_meta:
+            result = processor.inspect(photo)
+        
+        mock_meta.assert_not_called()
+        assert (result.thumbnail, result.preview) == (b'thumb', b'preview')
+        assert result.media_type == 'image'
+    
+    def test_inspect_video_extracts_one_frame(self, processor, tmp_path):
+        """Test thumbnail and preview share a single extracted frame."""
+        from PIL import Image
+        frame = tmp_path / "frame.jpg"
+        Image.new('RGB', (64, 64)).save(frame)
+        
+        with patch.object(processor, '_extract_video_frame', return_value=str(frame)) as mock_frame, \
+                patch.object(processor, 'generate_thumbnail', return_value=b'thumb'), \
+                patch.object(processor, 'generate_preview', return_value=b'preview'), \
+                patch.object(processor, 'extract_metadata', return_value='info'):
+            result = processor.inspect("video.mp4")
+        
+        mock_frame.assert_called_once()
+        assert result.is_video is True
+        assert (result.thumbnail, result.preview, result.metadata) == (b'thumb', b'preview', 'info')
+        assert not frame.exists()
+    
+    def test_inspect_without_images(self, processor):
+        """Test generate_images=False only extracts metadata."""
+        with patch.object(processor, '_extract_video_frame') as mock_frame, \
+                patch.object(processor, 'extract_metadata', return_value='info'):
+            result = processor.inspect("video.mp4", generate_images=False)
+        
+        mock_frame.assert_not_called()
+        assert result.thumbnail is None
+        assert result.metadata == 'info'
+    
+    def test_metadata_cached_for_unchanged_file(self, processor, tmp_path):
+        """Test an unchanged file is only probed once."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b'data')
+        
+        with patch.object(processor, 'extract_metadata', return_value='info') as mock_meta:
+            assert processor.probe_metadata(video) == 'info'
+            assert processor.probe_metadata(str(video)) == 'info'
+        
+        mock_meta.assert_called_once()
+    
+    def test_metadata_reprobed_when_file_changes(self, processor, tmp_path):
+        """Test a new size or mtime invalidates the cached metadata."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b'data')
+        
+        with patch.object(processor, 'extract_metadata', side_effect=['old', 'new']) as mock_meta:
+            assert processor.probe_metadata(video) == 'old'
+            video.write_bytes(b'longer data')
+            assert processor.probe_metadata(video) == 'new'
+        
+        assert mock_meta.call_count == 2
+    
+    def test_failed_probe_not_cached(self, processor, tmp_path):
+        """Test a failed probe is retried on the next call."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b'data')
+        
+        with patch.object(processor, 'extract_metadata', side_effect=[None, 'info']):
+            assert processor.probe_metadata(video) is None
+            assert processor.probe_metadata(video) == 'info'
+    
+    def test_image_services_are_reused(self, processor):
+        """Test thumbnail/preview services are created once per processor."""
+        processor.generate_thumbnail(b'not an image')
+        processor.generate_preview(b'not an image')
+        thumb_service = processor._thumbnail_service
+        preview_service = processor._preview_service
+        
+        processor.generate_thumbnail(b'not an image')
+        processor.generate_preview(b'not an image')
+        
+        assert thumb_service is not None and processor._thumbnail_service is thumb_service
+        assert preview_service is not None and processor._preview_service is preview_service
+    
+    def test_images_share_one_decode(self, processor, tmp_path):
+        """Test thumbnail and preview are generated from one opened image."""
+        from PIL import Image
+        photo = tmp_path / "photo.jpg"
+        Image.new('RGB', (4096, 2048), (200, 10, 10)).save(photo)
+        
+        with patch.object(Image, 'open', wraps=Image.open) as mock_open:
+            result = processor.inspect(photo)
+        
+        mock_open.assert_called_once()
+        assert Image.open(io.BytesIO(result.thumbnail)).size == (320, 160)
+        assert Image.open(io.BytesIO(result.preview)).size == (1024, 512)
 
 
 class TestMediaResult:
@@ -0,0 +1,27 @@
+"""Tests for node key decryption."""
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+from megapy.core.crypto import Base64Encoder
+from megapy.core.nodes.decryptor import KeyDecryptor
+
+
+class TestDecryptNodeKeys:
+    """Test suite for KeyDecryptor.decrypt_node_keys()."""
+
+    def test_batch_matches_per_node_decryption(self):
+        """Test batched keys match decrypt_node_key() for every node."""
+        master_key = get_random_bytes(16)
+        cipher = AES.new(master_key, AES.MODE_ECB)
+        nodes = [
+            {'h': 'file', 'k': 'u:' + Base64Encoder.encode(cipher.encrypt(get_random_bytes(32)))},
+            {'h': 'nokey'},
+            {'h': 'folder', 'k': 'u:' + Base64Encoder.encode(cipher.encrypt(get_random_bytes(16)))},
+            {'h': 'short', 'k': 'u:' + Base64Encoder.encode(b'\x01' * 10)},
+        ]
+        decryptor = KeyDecryptor()
+
+        keys = decryptor.decrypt_node_keys(nodes, master_key)
+
+        assert keys == [decryptor.decrypt_node_key(node, master_key) for node in nodes]
+        assert [len(k) if k else None for k in keys] == [32, None, 16, None]
@@ -322,6 +322,21 @@ class TestSQLiteSession:
             session.delete_file()
             
             assert not session_path.exists()
+            assert list(Path(tmpdir).iterdir()) == []
+    
+    def test_uses_wal_journal(self, temp_session):
+        """Test connections run in WAL mode."""
+        with temp_session._get_connection() as conn:
+            mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+        
+        assert mode == 'wal'
+    
+    def test_cache_roundtrip(self, temp_session):
+        """Test cached values are stored as JSON and read back."""
+        temp_session.set_cache('codecs', {'container': {'1': 'mp4'}})
+        
+        assert temp_session.get_cache('codecs') == {'container': {'1': 'mp4'}}
+        assert temp_session.get_cache('missing') is None
     
     def test_persistence(self):
         """Test that data persists across sessions."""
@@ -0,0 +1,60 @@
+"""Tests for UploadCoordinator chunk processing."""
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+from megapy.core.upload.coordinator import UploadCoordinator
+
+
+class TestChunkProgress:
+    """Test suite for upload progress reporting."""
+
+    CHUNK = 256 * 1024
+
+    @pytest.fixture
+    def reports(self):
+        """Collected (uploaded_chunks, uploaded_bytes) snapshots."""
+        return []
+
+    @pytest.fixture
+    def coordinator(self, reports):
+        """Create UploadCoordinator recording progress snapshots."""
+        reader = Mock(spec=['read_chunk'])
+        reader.read_chunk = AsyncMock(side_effect=lambda path, start, end: bytes(end - start))
+        return UploadCoordinator(
+            api_client=AsyncMock(),
+            master_key=b'\x00' * 16,
+            file_reader=reader,
+            progress_callback=lambda p: reports.append((p.uploaded_chunks, p.uploaded_bytes))
+        )
+
+    @pytest.fixture
+    def uploader(self):
+        """Create chunk uploader stub that finishes with a token."""
+        uploader = Mock()
+        uploader.upload_chunk = AsyncMock(return_value='')
+        uploader.get_upload_token = Mock(return_value='token')
+        return uploader
+
+    async def _upload(self, coordinator, uploader, count):
+        chunks = [(i * self.CHUNK, (i + 1) * self.CHUNK) for i in range(count)]
+        encryption = Mock()
+        encryption.encrypt_chunk = Mock(side_effect=lambda i, data: data)
+        await coordinator._upload_chunks(
+            Path('file.bin'), chunks, encryption, uploader, count * self.CHUNK
+        )
+
+    @pytest.mark.asyncio
+    async def test_progress_coalesced_by_bytes(self, coordinator, uploader, reports):
+        """Test progress is reported every PROGRESS_MIN_BYTES, not per chunk."""
+        await self._upload(coordinator, uploader, 40)
+
+        assert [chunks for chunks, _ in reports] == [16, 32, 40]
+        assert uploader.upload_chunk.await_count == 40
+
+    @pytest.mark.asyncio
+    async def test_final_progress_always_reported(self, coordinator, uploader, reports):
+        """Test a small upload still reports its completed state."""
+        await self._upload(coordinator, uploader, 3)
+
+        assert reports == [(3, 3 * self.CHUNK)]
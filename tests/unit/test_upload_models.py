@@ -176,6 +176,7 @@ class TestUploadConfig:
         assert config.encryption_key is None
         assert config.max_concurrent_uploads == 4
         assert config.timeout == 120
+        assert config.file_size is None
 
 
 class TestUploadResult:
@@ -8,6 +8,7 @@ import os
 from megapy.core.upload.services import (
     FileValidator,
     AsyncFileReader,
+    MmapFileReader,
     ChunkUploader
 )
 
@@ -116,6 +117,64 @@ class TestAsyncFileReader:
         assert result is None
 
 
+class TestMmapFileReader:
+    """Test suite for MmapFileReader."""
+    
+    @pytest.fixture
+    def temp_file(self):
+        """Create temporary file with known content."""
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b"0123456789ABCDEFGHIJ")
+        os.close(fd)
+        yield Path(path)
+        os.unlink(path)
+    
+    @pytest.mark.asyncio
+    async def test_read_chunks_from_mapping(self, temp_file):
+        """Test chunks are sliced from the open mapping."""
+        reader = MmapFileReader()
+        await reader.open_file(temp_file)
+        
+        assert await reader.read_chunk(temp_file, 5, 15) == b"56789ABCDE"
+        assert await reader.read_chunk(temp_file, 15, 25) == b"FGHIJ"
+        assert await reader.read_chunk(temp_file, 20, 30) is None
+        
+        await reader.close_file()
+        assert reader._mmap is None
+    
+    @pytest.mark.asyncio
+    async def test_read_without_open(self, temp_file):
+        """Test reading works without open_file()."""
+        reader = MmapFileReader()
+        
+        assert await reader.read_chunk(temp_file, 0, 10) == b"0123456789"
+        assert await reader.read_file(temp_file) == b"0123456789ABCDEFGHIJ"
+    
+    @pytest.mark.asyncio
+    async def test_read_nonexistent_file(self):
+        """Test reading non-existent file returns None."""
+        reader = MmapFileReader()
+        
+        assert await reader.read_chunk(Path("/nonexistent/file.txt"), 0, 100) is None
+    
+    @pytest.mark.asyncio
+    async def test_reads_run_off_the_event_loop(self, temp_file):
+        """Test file reads run in a worker thread."""
+        import threading
+        reader = MmapFileReader()
+        threads = []
+        read_range = MmapFileReader._read_range
+        
+        def record(*args):
+            threads.append(threading.get_ident())
+            return read_range(*args)
+        
+        with patch.object(MmapFileReader, '_read_range', staticmethod(record)):
+            assert await reader.read_chunk(temp_file, 0, 4) == b"0123"
+        
+        assert threads and threads[0] != threading.get_ident()
+
+
 class TestChunkUploader:
     """Test suite for ChunkUploader."""
     